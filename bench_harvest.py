@@ -0,0 +1,125 @@
+"""
+수집 파이프라인 종단 벤치마크 (로컬 대역 서버 사용, API 키 불필요)
+
+대역 서버(onbid_stub_server)를 띄우고 KamcoAuctionService로 단계별 처리량 측정
+- 수집: 초당 페이지 수 / 초당 건수 (get_all_items, 파일 저장 없이)
+- 파싱: 초당 건수 (parse_auction_response)
+- 가공: 초당 행 수 (build_dataframe + enrich_dataframe)
+- 저장: 초당 행 수 (Parquet / Feather / Excel)
+실행: python bench_harvest.py --total 20000 --latency 0.05 --json bench.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from main import (HAS_PYARROW, KamcoAuctionService, build_dataframe, enrich_dataframe,
+                  parse_auction_response)
+from onbid_stub_server import build_response, make_server
+
+def timed(func, *args, **kwargs):
+    """
+    실행 시간(초)과 결과 반환
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def bench_harvest(service, server, options):
+    requests_before = server.request_count
+    elapsed, items = timed(service.get_all_items, save_files=False, **options)
+    pages = server.request_count - requests_before
+    return {
+        'pages_per_sec': pages / elapsed,
+        'items_per_sec': len(items) / elapsed,
+        'pages': pages,
+        'items': len(items),
+        'seconds': elapsed
+    }, items
+
+def bench_parse(rows, page_size=1000, repeat=20):
+    rows = rows[:page_size]
+    content = build_response(rows, page_size, 1, len(rows))
+    chunks = [content[i:i + 64 * 1024] for i in range(0, len(content), 64 * 1024)]
+    elapsed, _ = timed(lambda: [parse_auction_response(chunks) for _ in range(repeat)])
+    return {'items_per_sec': len(rows) * repeat / elapsed}
+
+def bench_enrich(items):
+    build_elapsed, df = timed(build_dataframe, items)
+    enrich_elapsed, _ = timed(enrich_dataframe, df)
+    return {
+        'build_rows_per_sec': len(items) / build_elapsed,
+        'enrich_rows_per_sec': len(items) / enrich_elapsed
+    }
+
+def bench_write(service, items, folder, formats):
+    results = {}
+    for fmt in formats:
+        filename = os.path.join(folder, f"bench.{fmt}")
+        if fmt == 'xlsx':
+            elapsed, _ = timed(service.save_data_to_excel, items, filename)
+        else:
+            elapsed, _ = timed(service.save_data_to_columnar, items, filename)
+        results[f"{fmt}_rows_per_sec"] = len(items) / elapsed
+        results[f"{fmt}_bytes"] = os.path.getsize(filename)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 파이프라인 종단 벤치마크")
+    parser.add_argument('--total', type=int, default=20000, help="대역 서버 물건 수 (기본: 20000)")
+    parser.add_argument('--latency', type=float, default=0.05, help="대역 서버 요청당 지연(초)")
+    parser.add_argument('--latency-per-row', type=float, default=0.0001, help="대역 서버 행당 지연(초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="대역 서버 오류 응답 비율")
+    parser.add_argument('--max-in-flight', type=int, default=8)
+    parser.add_argument('--requests-per-second', type=float, default=40.0)
+    parser.add_argument('--shard', action='store_true', help="입찰일자 구간별 수집으로 측정")
+    parser.add_argument('--json', metavar='PATH', help="결과를 JSON으로 저장 (회귀 비교용)")
+    args = parser.parse_args()
+
+    server = make_server(0, args.total, args.latency, args.latency_per_row, args.error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = {'config': vars(args)}
+    with tempfile.TemporaryDirectory() as folder:
+        # 청크/백업 폴더가 작업 폴더에 생성되므로 임시 폴더에서 실행
+        previous_cwd = os.getcwd()
+        os.chdir(folder)
+        try:
+            service = KamcoAuctionService('stub-service-key', output_format='parquet')
+            service.base_url = server.base_url
+
+            results['harvest'], items = bench_harvest(service, server, dict(
+                max_in_flight=args.max_in_flight,
+                requests_per_second=args.requests_per_second,
+                shard=args.shard
+            ))
+            # 수집 중 단계별 처리 시간 (요청/파싱 지연 분포)
+            results['stages'] = service.metrics.summary()['stages']
+            results['parse'] = bench_parse(server.dataset.query('0001'))
+            results['enrich'] = bench_enrich(items)
+            formats = (['parquet', 'feather'] if HAS_PYARROW else []) + ['xlsx']
+            results['write'] = bench_write(service, items, folder, formats)
+        finally:
+            os.chdir(previous_cwd)
+            server.shutdown()
+
+    print("\n===== 벤치마크 결과 =====")
+    harvest = results['harvest']
+    print(f"수집: {harvest['pages_per_sec']:,.1f}페이지/초, {harvest['items_per_sec']:,.0f}건/초 "
+          f"({harvest['pages']:,}페이지, {harvest['items']:,}건, {harvest['seconds']:.1f}초)")
+    print(f"파싱: {results['parse']['items_per_sec']:,.0f}건/초")
+    print(f"가공: DataFrame 변환 {results['enrich']['build_rows_per_sec']:,.0f}행/초, "
+          f"동/층/호 추출 {results['enrich']['enrich_rows_per_sec']:,.0f}행/초")
+    for fmt in formats:
+        print(f"저장({fmt}): {results['write'][f'{fmt}_rows_per_sec']:,.0f}행/초 "
+              f"({results['write'][f'{fmt}_bytes'] / 1024 / 1024:.1f}MB)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+XML 파서 마이크로 벤치마크
+
+기존 방식(ET.fromstring + 필드별 item.find)과
+스트리밍 방식(parse_auction_response)의 초당 처리 건수 비교
+실행: python bench_parser.py
+
+처리 시간 대부분은 두 방식 모두 거치는 C XML 파서(feed)이므로 속도 차이는 작음
+(측정 예, Python 3.11: 100건/페이지 약 0.9배, 1,000건/페이지 약 1.0~1.2배).
+스트리밍 방식의 이점은 속도보다 응답 전체를 트리로 올리지 않는 메모리 사용량
+"""
+import time
+import xml.etree.ElementTree as ET
+
+from main import FIELD_MAPPING, parse_auction_response
+
+def build_sample_response(num_items=1000):
+    """
+    벤치마크용 getPublicSaleObject 응답 XML 생성
+    """
+    items = []
+    for i in range(num_items):
+        fields = ''.join(f"<{tag}>{tag}_{i}</{tag}>" for tag in FIELD_MAPPING)
+        items.append(f"<item>{fields}</item>")
+
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<response><header><resultCode>00</resultCode><resultMsg>NORMAL SERVICE.</resultMsg></header>'
+        f"<body><items>{''.join(items)}</items>"
+        f"<numOfRows>{num_items}</numOfRows><pageNo>1</pageNo><totalCount>{num_items}</totalCount></body></response>"
+    )
+    return xml.encode('utf-8')
+
+def parse_legacy(content):
+    """
+    기존 방식: 전체 트리 로드 후 항목마다 매핑 dict 재생성 + 필드별 find
+    """
+    root = ET.fromstring(content)
+    items = []
+    for item in root.findall('.//item'):
+        field_mapping = dict(FIELD_MAPPING)
+        data = {}
+        for eng_field, kor_field in field_mapping.items():
+            value = item.find(eng_field)
+            data[kor_field] = value.text if value is not None else ''
+        items.append(data)
+    return items
+
+def parse_streaming(content, chunk_size=64 * 1024):
+    """
+    스트리밍 방식: 64KB 단위로 나눠 파서에 전달
+    """
+    chunks = (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+    header, items = parse_auction_response(chunks)
+    return items
+
+def measure(parse_func, content, num_items, repeat=20):
+    """
+    repeat회 파싱 후 초당 처리 건수 반환
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        items = parse_func(content)
+    elapsed = time.perf_counter() - start
+    assert len(items) == num_items
+    return num_items * repeat / elapsed
+
+def main():
+    for num_items in [100, 1000]:
+        content = build_sample_response(num_items)
+        assert parse_legacy(content) == parse_streaming(content)
+
+        legacy = measure(parse_legacy, content, num_items)
+        streaming = measure(parse_streaming, content, num_items)
+        print(f"[{num_items:,}건/페이지] 기존: {legacy:,.0f}건/초, 스트리밍: {streaming:,.0f}건/초 ({streaming / legacy:.2f}배)")
+
+if __name__ == "__main__":
+    main()
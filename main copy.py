@@ -15,6 +15,7 @@ from openpyxl.styles import Font, PatternFill, Border, Side
 from openpyxl.styles import Alignment
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from main import enrich_dataframe
 import re
 
 # .env 파일 로드
@@ -243,63 +244,6 @@ class KamcoAuctionService:
             abs_filename = os.path.abspath(filename)
             print(f"파일 저장 시도: {abs_filename}")
             
-            # DataFrame 생성 전에 숫자 데이터 처리 및 주소 정보 추출
-            for item in items:
-                if '감정가' in item and item['감정가']:
-                    try:
-                        item['감정가'] = int(item['감정가'].replace(',', ''))
-                    except:
-                        pass
-                if '최저입찰가' in item and item['최저입찰가']:
-                    try:
-                        item['최저입찰가'] = int(item['최저입찰가'].replace(',', ''))
-                    except:
-                        pass
-                
-                # 주거용건물인 경우 동, 층, 호 정보 추출
-                if '용도명' in item and item['용도명'] and item['용도명'].startswith('주거용건물'):
-                    address = item.get('물건소재지(지번)', '') or item.get('물건소재지(도로명)', '')
-                    
-                    # 동 정보 추출 (101동, 가동, 에이동 등)
-                    dong = ''
-                    dong_patterns = [
-                        r'(\d+동)',  # 101동
-                        r'([가-힣]동)',  # 가동
-                        r'([A-Z]동)',  # A동
-                        r'([가-힣]+동)',  # 에이동
-                        r'([가-힣]+타워)',  # 에이타워
-                        r'([가-힣]+빌딩)'  # 에이빌딩
-                    ]
-                    for pattern in dong_patterns:
-                        match = re.search(pattern, address)
-                        if match:
-                            dong = match.group(1)
-                            break
-                    
-                    # 층 정보 추출
-                    floor = ''
-                    floor_match = re.search(r'(\d+)층', address)
-                    if floor_match:
-                        floor = floor_match.group(1)
-                    
-                    # 호 정보 추출
-                    ho = ''
-                    ho_patterns = [
-                        r'(\d+)호',  # 101호
-                        r'(\d+-\d+)호',  # 101-101호
-                        r'(\d+-\d+-\d+)호'  # 101-101-101호
-                    ]
-                    for pattern in ho_patterns:
-                        match = re.search(pattern, address)
-                        if match:
-                            ho = match.group(1)
-                            break
-                    
-                    # 추출된 정보 저장
-                    item['동'] = dong
-                    item['층'] = floor
-                    item['호'] = ho
-            
             # 헤더 순서 정의
             columns_order = [
                 '순번',
@@ -344,8 +288,8 @@ class KamcoAuctionService:
                 # '물건 이미지'
             ]
             
-            # DataFrame 생성 시 컬럼 순서 유지
-            df = pd.DataFrame(items, columns=columns_order)
+            # 가공 단계 (가격 숫자 변환, 주거용건물 동/층/호 추출) 후 컬럼 순서 유지
+            df = enrich_dataframe(pd.DataFrame(items)).reindex(columns=columns_order)
             
             # 엑셀 파일 생성
             with pd.ExcelWriter(abs_filename, engine='openpyxl') as writer:
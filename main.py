@@ -9,231 +9,2412 @@ import sys
 import math
 from multiprocessing import Pool, cpu_count
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import queue
+from collections import deque
+from contextlib import contextmanager
+from collections.abc import Mapping
 import numpy as np
 import openpyxl  # openpyxl 모듈 추가
 from openpyxl.styles import Font, PatternFill, Border, Side
 from openpyxl.styles import Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+import sqlite3
+import hashlib
+import json
+import argparse
+import re
+import gzip
+import random
 
 # .env 파일 로드
 load_dotenv()
 
-# 서비스 키 가져오기
+# 서비스 키 가져오기 (실행 시 확인, 모듈 import는 키 없이도 가능)
 SERVICE_KEY = os.getenv('API_KEY_KAMCO_Decoding')
-if not SERVICE_KEY:
-    print(".env 파일에 API_KEY_KAMCO_Decoding를 설정해주세요.")
-    sys.exit(1)
+
+# 영문-한글 필드 매핑 (공매물건 목록 조회 응답의 item 하위 태그)
+FIELD_MAPPING = {
+    'RNUM': '순번',
+    'PLNM_NO': '공고번호',
+    'PBCT_NO': '공매번호',
+    'PBCT_CDTN_NO': '공매조건번호',
+    'CLTR_NO': '물건번호',
+    'CLTR_HSTR_NO': '물건이력번호',
+    'SCRN_GRP_CD': '화면그룹코드',
+    'CTGR_FULL_NM': '용도명',
+    'BID_MNMT_NO': '입찰번호',
+    'CLTR_NM': '물건명',
+    'CLTR_MNMT_NO': '물건관리번호',
+    'LDNM_ADRS': '물건소재지(지번)',
+    'NMRD_ADRS': '물건소재지(도로명)',
+    'LDNM_PNU': '지번PNU',
+    'DPSL_MTD_CD': '처분방식코드',
+    'DPSL_MTD_NM': '처분방식코드명',
+    'BID_MTD_NM': '입찰방식명',
+    'MIN_BID_PRC': '최저입찰가',
+    'APSL_ASES_AVG_AMT': '감정가',
+    'FEE_RATE': '최저입찰가율',
+    'PBCT_BEGN_DTM': '입찰시작일시',
+    'PBCT_CLS_DTM': '입찰마감일시',
+    'PBCT_CLTR_STAT_NM': '물건상태',
+    'USCBD_CNT': '유찰횟수',
+    'IQRY_CNT': '조회수',
+    'GOODS_NM': '물건상세정보',
+    'MANF': '제조사',
+    'MDL': '모델',
+    'NRGT': '연월식',
+    'GRBX': '변속기',
+    'ENDPC': '배기량',
+    'VHCL_MLGE': '주행거리',
+    'FUEL': '연료',
+    'SCRT_NM': '법인명',
+    'TPBZ': '업종',
+    'ITM_NM': '종목명',
+    'MMB_RGT_NM': '회원권명',
+    'CLTR_IMG_FILE': '물건 이미지'
+}
+
+# 응답에 없는 필드는 빈 문자열로 채움
+EMPTY_ITEM = dict.fromkeys(FIELD_MAPPING.values(), '')
+
+ITEM_FIELDS = tuple(FIELD_MAPPING.values())
+ITEM_FIELD_INDEX = {field: index for index, field in enumerate(ITEM_FIELDS)}
+
+# 값 종류가 적어 물건마다 같은 문자열이 반복되는 필드 (sys.intern으로 한 객체만 보관)
+INTERNED_TAGS = {
+    'PBCT_CDTN_NO', 'SCRN_GRP_CD', 'CTGR_FULL_NM', 'DPSL_MTD_CD', 'DPSL_MTD_NM', 'BID_MTD_NM',
+    'FEE_RATE', 'PBCT_BEGN_DTM', 'PBCT_CLS_DTM', 'PBCT_CLTR_STAT_NM', 'USCBD_CNT',
+    'MANF', 'MDL', 'GRBX', 'FUEL', 'TPBZ', 'ITM_NM'
+}
+# 태그 → (값 위치, intern 여부)
+TAG_SLOTS = {tag: (index, tag in INTERNED_TAGS) for index, tag in enumerate(FIELD_MAPPING)}
+
+# 물건 상세 조회(물건정보조회서비스 getUnifyUsageCltrBasicInfoDetail) 응답 중 목록에 없는 필드
+DETAIL_FIELD_MAPPING = {
+    'CTGR_TYPE_NM': '물건종류',
+    'PRPT_DVSN_NM': '재산종류',
+    'ORG_NM': '입찰집행기관',
+    'RGST_DEPT_NM': '담당부서',
+    'PSCG_NM': '담당자',
+    'PSCG_TPNO': '담당자연락처',
+    'DLGT_ORG_NM': '위임기관',
+    'LAND_SQMS': '토지면적',
+    'BLD_SQMS': '건물면적',
+    'BLD_NM': '건물명',
+    'SHR_YN': '지분여부',
+    'ELVT_YN': '승강기여부',
+    'PKLT_YN': '주차장여부',
+    'POSI_ENV_PSCD': '위치및부근현황',
+    'UTLZ_PSCD': '이용현황',
+    'ETC_DTL_CNTN': '기타사항',
+    'VHC_NO': '차량번호',
+    'CSTD_PLC': '보관장소',
+    'QNTY': '수량',
+    'PCMT_PYMT_EPDT_CNTN': '대금납부기한',
+    'DLVR_RSBY': '명도책임',
+    'ICDL_CDTN': '부대조건',
+    'SHR_RQR_EPRT_DT': '배분요구종기'
+}
+DETAIL_COLUMNS = list(DETAIL_FIELD_MAPPING.values())
+DETAILED_ITEM_FIELDS = ITEM_FIELDS + tuple(DETAIL_COLUMNS)
+
+class AuctionRecord(Mapping):
+    """
+    물건 한 건 (한글 필드명 → 값)
+
+    필드 이름은 모든 레코드가 ITEM_FIELDS를 공유하고 값 목록만 보관하므로
+    38개 키를 가진 dict보다 훨씬 작음. dict처럼 item['물건명'], item.get(), dict(item) 사용 가능
+    """
+    __slots__ = ('data',)
+    FIELDS = ITEM_FIELDS
+    FIELD_INDEX = ITEM_FIELD_INDEX
+
+    def __init__(self, data):
+        self.data = data  # FIELDS 순서의 값 목록
+
+    def __getitem__(self, field):
+        return self.data[self.FIELD_INDEX[field]]
+
+    def __setitem__(self, field, value):
+        self.data[self.FIELD_INDEX[field]] = value
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+class DetailedAuctionRecord(AuctionRecord):
+    """
+    상세 조회 필드(DETAIL_COLUMNS)까지 값 목록 뒤에 이어 보관하는 물건 (fetch_details=True)
+    """
+    __slots__ = ()
+    FIELDS = DETAILED_ITEM_FIELDS
+    FIELD_INDEX = {field: index for index, field in enumerate(DETAILED_ITEM_FIELDS)}
+
+def parse_item_element(item):
+    """
+    item 요소의 하위 태그를 한 번만 순회하여 AuctionRecord로 변환
+    """
+    data = [''] * len(ITEM_FIELDS)
+    for child in item:
+        slot = TAG_SLOTS.get(child.tag)
+        if slot is not None:
+            value = child.text
+            data[slot[0]] = sys.intern(value) if slot[1] and value else value
+    return AuctionRecord(data)
+
+def parse_auction_response(chunks):
+    """
+    공매물건 목록 응답 XML을 스트리밍 방식으로 파싱
+
+    chunks: 응답 본문 바이트 조각 (response.iter_content 등)
+    반환: (헤더 정보 dict, 물건 목록 list)
+
+    조각이 도착할 때마다 완성된 <item> 구간만 잘라 파싱하고 버퍼에서 제거하므로
+    응답 전체를 트리로 올리지 않음. 요소별 이벤트를 파이썬에서 처리하는
+    XMLPullParser보다 C 파서에 구간 단위로 넘기는 편이 빠름.
+    """
+    items = []
+    head = None
+    buffer = b''
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+
+        # <items> 이전(헤더)은 마지막에 응답 꼬리와 함께 파싱
+        if head is None:
+            start = buffer.find(b'<items>')
+            if start < 0:
+                continue
+            start += len(b'<items>')
+            head, buffer = buffer[:start], buffer[start:]
+
+        # 완성된 item 구간만 파싱 후 버퍼에서 제거
+        end = buffer.rfind(b'</item>')
+        if end < 0:
+            continue
+        end += len(b'</item>')
+        block = ET.fromstring(b'<items>' + buffer[:end] + b'</items>')
+        buffer = buffer[end:]
+        items.extend(parse_item_element(item) for item in block)
+
+    # 헤더 + 남은 부분 (resultCode, totalCount 등)
+    root = ET.fromstring((head or b'') + buffer)
+    header = {}
+    for tag in ('resultCode', 'resultMsg', 'totalCount', 'numOfRows', 'pageNo'):
+        elem = root.find(f'.//{tag}')
+        if elem is not None:
+            header[tag] = elem.text
+    items.extend(parse_item_element(item) for item in root.iter('item'))
+
+    return header, items
+
+def parse_detail_response(content):
+    """
+    물건 상세 조회 응답 XML 파싱 (응답이 작아 한 번에 파싱)
+
+    반환: (헤더 정보 dict, 상세 필드 dict), 물건이 없으면 상세 필드는 빈 dict
+    """
+    root = ET.fromstring(content)
+    header = {}
+    for tag in ('resultCode', 'resultMsg'):
+        elem = root.find(f'.//{tag}')
+        if elem is not None:
+            header[tag] = elem.text
+    
+    detail = {}
+    item = root.find('.//item')
+    if item is not None:
+        for child in item:
+            field = DETAIL_FIELD_MAPPING.get(child.tag)
+            if field is not None and child.text and child.text.strip():
+                detail[field] = child.text.strip()
+    return header, detail
+
+# 저장 파일 헤더 순서
+COLUMNS_ORDER = [
+    '변경구분',
+    '순번',
+    '물건관리번호',
+    '용도명',
+    '물건명',
+    '물건소재지(지번)',
+    '지번PNU',
+    '물건소재지(도로명)',
+    '동', '층', '호',
+    '입찰방식명',
+    '감정가',
+    '최저입찰가',
+    '최저입찰가율',
+    '입찰시작일시',
+    '입찰마감일시',
+    '물건상태',
+    '유찰횟수',
+    '조회수',
+    '물건상세정보',
+    '공고번호',
+    '공매번호',
+    '공매조건번호',
+    '물건번호',
+    '물건이력번호',
+    '화면그룹코드',
+    '입찰번호',
+    '처분방식코드',
+    '처분방식코드명',
+    '제조사',
+    '모델',
+    '연월식',
+    '변속기',
+    '배기량',
+    '주행거리',
+    '연료',
+    '법인명',
+    '업종',
+    '종목명',
+    '회원권명',
+    '물건 이미지',
+    *DETAIL_COLUMNS,
+    '상세URL'
+]
+
+# 컬럼형 저장 시 타입 지정
+NUMERIC_COLUMNS = ['순번', '감정가', '최저입찰가', '유찰횟수', '조회수']
+DATETIME_COLUMNS = ['입찰시작일시', '입찰마감일시']  # YYYYMMDDHH24MISS
+CATEGORY_COLUMNS = ['변경구분', '용도명', '화면그룹코드', '처분방식코드', '처분방식코드명', '입찰방식명', '물건상태']
+
+# 컬럼형 저장(Parquet/Feather)은 pyarrow 필요, 없으면 엑셀로 저장
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 주거용건물 주소에서 동/층/호 추출
+# 항목별 후보 패턴을 우선순위대로 시도 (앞 패턴이 주소 어디에서든 맞으면 그 결과 사용)
+#   동: (\d+동) > ([가-힣]동) > ([A-Z]동) > ([가-힣]+타워) > ([가-힣]+빌딩)
+#   층: (\d+)층
+#   호: (\d+)호
+# ([가-힣]+동)은 ([가-힣]동)이, (\d+-\d+)호/(\d+-\d+-\d+)호는 (\d+)호가 항상 먼저 맞으므로 생략
+# 정규식을 주소 전체에 여러 번 돌리는 대신 표지 글자(동/층/호)를 찾아 바로 앞 글자만 확인
+BUILDING_PATTERNS = [
+    ('타워', re.compile(r'([가-힣]+타워)')),  # 에이타워
+    ('빌딩', re.compile(r'([가-힣]+빌딩)'))  # 에이빌딩
+]
+
+def digits_before(address, marker):
+    """
+    주소에서 처음으로 marker 바로 앞에 붙은 숫자 (없으면 None)
+    """
+    end = address.find(marker)
+    while end >= 0:
+        start = end
+        while start > 0 and address[start - 1].isdecimal():
+            start -= 1
+        if start < end:
+            return address[start:end]
+        end = address.find(marker, end + 1)
+    return None
+
+def char_before(address, marker, low, high):
+    """
+    주소에서 처음으로 marker 바로 앞 글자가 low~high 범위인 부분 (없으면 None)
+    """
+    end = address.find(marker)
+    while end >= 0:
+        if end and low <= address[end - 1] <= high:
+            return address[end - 1:end + 1]
+        end = address.find(marker, end + 1)
+    return None
+
+def extract_address_parts(address):
+    """
+    주소에서 (동, 층, 호) 추출, 없는 항목은 빈 문자열
+    """
+    dong = digits_before(address, '동')
+    if dong is not None:
+        dong += '동'
+    else:
+        dong = char_before(address, '동', '가', '힣') or char_before(address, '동', 'A', 'Z')
+        for word, pattern in BUILDING_PATTERNS:
+            if dong is not None:
+                break
+            if word in address:
+                match = pattern.search(address)
+                dong = match.group(1) if match else None
+    return dong or '', digits_before(address, '층') or '', digits_before(address, '호') or ''
+
+def enrich_dataframe(df):
+    """
+    수집 데이터 가공 단계 (컬럼 단위로 처리)
+
+    - 감정가/최저입찰가: 천 단위 구분자를 제거하고 숫자로 변환
+    - 주거용건물: 물건소재지(지번, 없으면 도로명)에서 동/층/호 추출
+    """
+    df = df.copy()
+
+    for col in ['감정가', '최저입찰가']:
+        if col in df.columns:
+            values = df[col].astype('string').str.replace(',', '', regex=False)
+            df[col] = pd.to_numeric(values, errors='coerce').astype('Int64')
+
+    df['동'] = ''
+    df['층'] = ''
+    df['호'] = ''
+    if '용도명' not in df.columns or '물건소재지(지번)' not in df.columns:
+        return df
+
+    residential = df['용도명'].astype('string').str.startswith('주거용건물').fillna(False).astype(bool)
+    if not residential.any():
+        return df
+
+    address = df.loc[residential, '물건소재지(지번)'].astype('string').replace('', pd.NA)
+    if '물건소재지(도로명)' in df.columns:
+        address = address.fillna(df.loc[residential, '물건소재지(도로명)'].astype('string'))
+    parts = [extract_address_parts(value) for value in address.fillna('').tolist()]
+    for col, values in zip(['동', '층', '호'], zip(*parts)):
+        column = np.full(len(df), '', dtype=object)
+        column[residential.to_numpy()] = values
+        df[col] = column
+
+    return df
+
+# 온비드 물건 상세 페이지 (파생 컬럼 '상세URL')
+DETAIL_URL_COLUMN = '상세URL'
+DETAIL_URL_BASE = "https://www.onbid.co.kr/op/cta/cltrdtl/collateralDetailMoveableAssetsDetail.do"
+DETAIL_URL_PARAMS = [
+    ('cltrHstrNo', '물건이력번호'),
+    ('cltrNo', '물건번호'),
+    ('plnmNo', '공고번호'),
+    ('pbctNo', '공매번호'),
+    ('scrnGrpCd', '화면그룹코드'),
+    ('pbctCdtnNo', '공매조건번호')
+]
+
+def add_detail_url(df):
+    """
+    상세 페이지 URL을 전체 데이터에 대해 한 번에 계산해 '상세URL' 컬럼으로 추가
+    (파라미터 중 하나라도 비어 있으면 빈 값)
+    """
+    if not all(col in df.columns for _, col in DETAIL_URL_PARAMS):
+        return df
+
+    url = pd.Series(DETAIL_URL_BASE, index=df.index, dtype='string')
+    valid = pd.Series(True, index=df.index)
+    for idx, (param, col) in enumerate(DETAIL_URL_PARAMS):
+        values = df[col].astype('string')
+        valid &= values.notna() & (values != '')
+        url = url + ('?' if idx == 0 else '&') + param + '=' + values.fillna('')
+
+    df[DETAIL_URL_COLUMN] = url.where(valid, '')
+    return df
+
+def merge_details(items, details):
+    """
+    상세 조회 결과를 물건번호/공매번호 기준으로 물건마다 상세 필드(DETAIL_COLUMNS)로 추가
+    (AuctionRecord는 값 목록을 이어 붙인 DetailedAuctionRecord로, dict는 dict로 반환, 조회하지 못한 물건은 빈 값)
+    """
+    merged = []
+    for item in items:
+        detail = details.get((str(item.get('물건번호') or ''), str(item.get('공매번호') or '')), {})
+        values = [detail.get(col) for col in DETAIL_COLUMNS]
+        if type(item) is AuctionRecord:
+            merged.append(DetailedAuctionRecord(item.data + values))
+        else:
+            merged.append({**item, **dict(zip(DETAIL_COLUMNS, values))})
+    return merged
+
+def build_dataframe(items):
+    """
+    물건 목록을 헤더 순서/컬럼 타입이 지정된 DataFrame으로 변환
+    """
+    record_type = type(items[0]) if items else None
+    if record_type in (AuctionRecord, DetailedAuctionRecord) and all(type(item) is record_type for item in items):
+        # 레코드 값을 컬럼 단위로 바로 모아 변환 (행마다 dict를 만들지 않음)
+        df = pd.DataFrame(dict(zip(record_type.FIELDS, zip(*(item.data for item in items)))))
+    else:
+        df = pd.DataFrame([dict(item) if isinstance(item, AuctionRecord) else item for item in items])
+    if DETAIL_URL_COLUMN not in df.columns:
+        df = add_detail_url(df)
+    df = df[[col for col in COLUMNS_ORDER if col in df.columns]]
+
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+    for col in DATETIME_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format='%Y%m%d%H%M%S', errors='coerce')
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].astype('string')
+
+    return df
+
+# Open API 결과 코드 (활용가이드 에러 코드 정리 기준)
+RETRYABLE_RESULT_CODES = {'01', '02', '04', '05', '22', '99'}  # 일시적 오류/요청 한도 초과: 대기 후 재시도
+FATAL_RESULT_CODES = {'12', '20', '21', '30', '31', '32', '33'}  # 서비스 키/권한 오류: 수집 중단
+NODATA_RESULT_CODE = '03'  # 데이터 없음: 빈 페이지로 처리
+
+class OnbidApiError(Exception):
+    """
+    API 호출 실패 (결과 코드/HTTP 상태에 따라 재시도 가능 여부 구분)
+    """
+    def __init__(self, message, result_code=None, retryable=True):
+        super().__init__(message)
+        self.result_code = result_code
+        self.retryable = retryable
+        self.fatal = result_code in FATAL_RESULT_CODES
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """
+    재시도 대기 시간: 지수 증가(base * 2^attempt, 최대 cap) 범위 안에서 무작위 (full jitter)
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class CircuitBreaker:
+    """
+    서비스 장애 시 요청을 멈추는 회로 차단기 (asyncio는 wait, 동기 코드는 try_acquire로 확인)
+
+    재시도 가능한 오류가 failure_threshold번 연속되면 열림(요청 중단) → reset_timeout초 후
+    요청 하나로 상태 확인(반열림). 확인 요청이 성공하면 닫힘, 실패하면 대기 시간을 두 배로 (최대 max_timeout)
+    확인 요청이 어느 쪽으로도 판정되지 않고 끝나면(재시도 불가 오류 등) release로 다음 요청이 다시 확인
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=10.0, max_timeout=300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_timeout = max_timeout
+        self.timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def try_acquire(self):
+        """
+        지금 요청을 보내도 되는지 확인: (기다릴 시간(초), 상태 확인 요청 여부) 반환
+        기다릴 시간이 0이면 바로 보내도 됨
+        """
+        if self.opened_at is None:
+            return 0, False
+        remaining = self.opened_at + self.timeout - time.monotonic()
+        if remaining <= 0 and not self.probing:
+            self.probing = True  # 이 요청으로 상태 확인
+            return 0, True
+        return max(remaining, 0.5), False
+
+    async def wait(self):
+        """
+        요청을 보내도 될 때까지 대기 (이 요청이 상태 확인 요청이면 True)
+        """
+        while True:
+            delay, probe = self.try_acquire()
+            if not delay:
+                return probe
+            await asyncio.sleep(delay)
+
+    def release(self):
+        """
+        상태 확인 요청 종료 (이미 성공/실패로 판정됐으면 변화 없음)
+        """
+        self.probing = False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            print("\nAPI 응답 정상화: 수집 재개")
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.timeout = self.reset_timeout
+
+    def record_failure(self):
+        self.failures += 1
+        if self.probing:
+            self.probing = False
+            self.opened_at = time.monotonic()
+            self.timeout = min(self.max_timeout, self.timeout * 2)
+            print(f"\nAPI 장애 지속: {self.timeout:.0f}초 후 다시 확인")
+        elif self.opened_at is None and self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            print(f"\n연속 {self.failures}회 실패: {self.timeout:.0f}초 동안 요청 중단")
+
+class PipelineMetrics:
+    """
+    수집 단계별 지표 (카운터, 처리 시간 히스토그램)
+
+    - onbid_requests_total{source}: 목록 조회 요청 수 (network/cache)
+    - onbid_api_results_total{result_code}: API 결과 코드별 응답 수
+    - onbid_retries_total{reason}: 재시도 수 (결과 코드 또는 network)
+    - onbid_stage_seconds{stage}: 단계별 처리 시간 (request, parse, enrich, write, index, history)
+    Prometheus 텍스트 형식(to_prometheus)과 실행 요약 JSON(summary)으로 내보냄.
+    process 모드에서는 작업 프로세스가 페이지마다 기록한 지표를 결과와 함께 돌려받아 합산(merge)
+    """
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}    # {(이름, 레이블): 값}
+        self.histograms = {}  # {(이름, 레이블): [구간별 건수..., 합계, 건수, 최대]}
+        self.started_at = datetime.now()
+        self.started = time.monotonic()
+
+    def __getstate__(self):
+        # 작업 프로세스로 넘길 때 잠금은 새로 생성
+        state = self.__dict__.copy()
+        state.pop('lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * len(self.BUCKETS) + [0.0, 0, 0.0]
+            for index, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    histogram[index] += 1
+                    break
+            histogram[-3] += seconds
+            histogram[-2] += 1
+            histogram[-1] = max(histogram[-1], seconds)
+
+    def merge(self, other):
+        """
+        다른 지표(작업 프로세스에서 기록한 지표 등)의 카운터/히스토그램을 더함
+        """
+        with self.lock:
+            for key, value in other.counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, values in other.histograms.items():
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    self.histograms[key] = list(values)
+                    continue
+                for index in range(len(values) - 1):
+                    histogram[index] += values[index]
+                histogram[-1] = max(histogram[-1], values[-1])
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('onbid_stage_seconds', time.perf_counter() - started, stage=stage, **labels)
+
+    @staticmethod
+    def format_labels(labels, **extra):
+        pairs = list(labels) + list(extra.items())
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{k}="{str(v)}"' for k, v in pairs) + '}'
+
+    def to_prometheus(self):
+        """
+        Prometheus 텍스트 형식 (node_exporter textfile 수집기 등으로 수집)
+        """
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, list(values)) for key, values in self.histograms.items())
+        
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{self.format_labels(labels)} {value}")
+        for (name, labels), values in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS, values):
+                cumulative += count
+                lines.append(f"{name}_bucket{self.format_labels(labels, le=bound)} {cumulative}")
+            lines.append(f"{name}_bucket{self.format_labels(labels, le='+Inf')} {values[-2]}")
+            lines.append(f"{name}_sum{self.format_labels(labels)} {values[-3]:.6f}")
+            lines.append(f"{name}_count{self.format_labels(labels)} {values[-2]}")
+        lines.append("# TYPE onbid_run_seconds gauge")
+        lines.append(f"onbid_run_seconds {time.monotonic() - self.started:.3f}")
+        return '\n'.join(lines) + '\n'
+
+    def quantile(self, values, q):
+        # 히스토그램 구간 상한으로 근사한 분위수
+        target = q * values[-2]
+        cumulative = 0
+        for bound, count in zip(self.BUCKETS, values):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, values[-1])
+        return values[-1]
+
+    def summary(self, **extra):
+        """
+        실행 요약 (JSON 저장용): 카운터, 단계별 건수/합계/평균/p50/p95/최대 시간
+        """
+        with self.lock:
+            counters = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                counters.setdefault(name, {})[','.join(f'{k}={v}' for k, v in labels) or 'total'] = value
+            stages = {}
+            for (name, labels), values in sorted(self.histograms.items()):
+                total, count = values[-3], values[-2]
+                stages[','.join(f'{v}' for _, v in labels) or name] = {
+                    'count': count,
+                    'total_seconds': round(total, 3),
+                    'avg_seconds': round(total / count, 4) if count else 0,
+                    'p50_seconds': self.quantile(values, 0.5),
+                    'p95_seconds': self.quantile(values, 0.95),
+                    'max_seconds': round(values[-1], 4)
+                }
+        return {
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'elapsed_seconds': round(time.monotonic() - self.started, 3),
+            **extra,
+            'counters': counters,
+            'stages': stages
+        }
+
+# 처분방식코드 (온비드코드조회에 없어 활용가이드 기준으로 고정)
+DISPOSAL_METHODS = {'0001': '매각', '0002': '임대(대부)'}
+
+class OnbidCodeTable:
+    """
+    온비드코드조회(OnbidCodeInfoInquireSvc) 코드표: 용도(대/중분류), 물건소재지(시도/시군구/읍면동)
+
+    처음 사용할 때 한 번 조회해 JSON 파일로 저장하고, refresh_days일이 지나면 다시 조회.
+    읍면동은 필요할 때 시도/시군구별로 조회해 같은 파일에 추가.
+    목록 조회의 서버 측 조건(CTGR_HIRK_ID / CTGR_HIRK_ID_MID / SIDO / SGK / EMD)을 만드는 데 사용
+    """
+    def __init__(self, service, path, refresh_days=7):
+        self.service = service
+        self.path = path
+        self.refresh_days = refresh_days
+        self.data = None
+
+    def load(self):
+        """
+        저장된 코드표 반환 (없거나 오래됐으면 다시 조회)
+        """
+        if self.data is not None:
+            return self.data
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if time.time() - data.get('fetched_at', 0) < self.refresh_days * 86400:
+                self.data = data
+                return data
+        return self.refresh()
+
+    def refresh(self):
+        """
+        용도 대/중분류, 시도/시군구 목록을 다시 조회해 저장
+        """
+        print("\n온비드 코드표 조회 중...")
+        get = self.service.get_code_items
+        categories = []
+        for top in get('getOnbidTopCodeInfo'):
+            categories.append({'id': top['CTGR_ID'], 'name': top['CTGR_NM'], 'parent_id': None, 'level': 1})
+            for middle in get('getOnbidMiddleCodeInfo', CTGR_ID=top['CTGR_ID']):
+                categories.append({'id': middle['CTGR_ID'], 'name': middle['CTGR_NM'],
+                                   'parent_id': top['CTGR_ID'], 'level': 2})
+        
+        regions = {}
+        for row in get('getOnbidAddr1Info'):
+            sido = row.get('ADDR1')
+            if sido:
+                regions[sido] = [r['ADDR2'] for r in get('getOnbidAddr2Info', ADDR1=sido) if r.get('ADDR2')]
+        
+        self.data = {
+            'fetched_at': time.time(),
+            'categories': categories,
+            'regions': regions,
+            'emds': {},  # {'시도|시군구': [읍면동]} (필요할 때 추가)
+            'disposal_methods': DISPOSAL_METHODS
+        }
+        self.save()
+        print(f"온비드 코드표 저장 완료: {self.path} (용도 {len(categories):,}개, 시도 {len(regions):,}개)")
+        return self.data
+
+    def save(self):
+        # 임시 파일에 쓴 뒤 교체 (중간에 중단돼도 기존 파일 유지)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def category_filter(self, category):
+        """
+        용도 이름/코드 → 목록 조회 조건
+        category: 대분류('부동산'), 중분류('주거용건물'), '부동산 / 주거용건물' 또는 코드 ID('10200')
+        """
+        categories = self.load()['categories']
+        parts = [part.strip() for part in str(category).split('/')]
+        if parts[0].isdigit():
+            matches = [entry for entry in categories if entry['id'] == parts[0]]
+        else:
+            names = {entry['id']: entry['name'] for entry in categories}
+            matches = [entry for entry in categories if entry['name'] == parts[-1] and
+                       (len(parts) == 1 or names.get(entry['parent_id']) == parts[0])]
+        if not matches:
+            raise ValueError(f"온비드 코드표에 없는 용도입니다: {category} "
+                             f"(예: {', '.join(entry['name'] for entry in categories[:5])})")
+        
+        # 같은 이름이 대분류/중분류에 모두 있으면 중분류 우선 (더 좁은 조건)
+        entry = max(matches, key=lambda entry: entry['level'])
+        if entry['level'] == 1:
+            return {'CTGR_HIRK_ID': entry['id']}
+        return {'CTGR_HIRK_ID': entry['parent_id'], 'CTGR_HIRK_ID_MID': entry['id']}
+
+    def region_filter(self, sido, sgk=None, emd=None):
+        """
+        물건소재지 → 목록 조회 조건 (시도, 시군구, 읍면동 순으로 좁힘)
+        """
+        regions = self.load()['regions']
+        if sido not in regions:
+            raise ValueError(f"온비드 코드표에 없는 시도입니다: {sido} (예: {', '.join(list(regions)[:5])})")
+        params = {'SIDO': sido}
+        if sgk:
+            if sgk not in regions[sido]:
+                raise ValueError(f"{sido}에 없는 시군구입니다: {sgk}")
+            params['SGK'] = sgk
+        if emd:
+            # 같은 이름의 시군구(중구, 동구 등)가 여러 시도에 있으므로 시도와 함께 구분
+            emd_key = f"{sido}|{sgk}"
+            emds = self.data['emds'].get(emd_key)
+            if emds is None:
+                emds = self.data['emds'][emd_key] = [
+                    row['ADDR3'] for row in self.service.get_code_items('getOnbidAddr3Info', ADDR1=sido, ADDR2=sgk)
+                    if row.get('ADDR3')
+                ]
+                self.save()
+            if emd not in emds:
+                raise ValueError(f"{sido} {sgk}에 없는 읍면동입니다: {emd}")
+            params['EMD'] = emd
+        return params
+
+class TokenBucket:
+    """
+    초당 요청 수 제한용 토큰 버킷 (asyncio)
+
+    rate: 초당 발급 토큰 수, capacity: 최대 누적 토큰 수 (순간 허용 요청 수)
+    토큰을 먼저 예약하고 부족한 만큼만 대기하므로, 여러 스레드의 이벤트 루프가 같은 버킷을 함께 써도 됨
+    (목록 수집과 상세 조회가 하나의 요청 한도를 공유)
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # 작업 프로세스로 넘길 때 잠금은 새로 생성
+        state = self.__dict__.copy()
+        state.pop('lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        토큰 1개 예약, 사용할 수 있을 때까지 기다릴 시간(초) 반환
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self):
+        """
+        토큰 1개를 얻을 때까지 대기
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class AdaptivePagePlan:
+    """
+    응답 시간/오류율에 따라 페이지 크기(numOfRows)를 조정하며 페이지 목록을 생성
+
+    페이지 크기는 min_page_size * 2^k 단계와 max_page_size(마지막 단계)만 사용.
+    크기를 키울 때는 다음 시작 위치가 새 크기의 배수가 될 때까지 기다리고, 줄일 때는 시작 위치를 나누는
+    2^k 단계 크기로 채워 새 크기의 배수에 맞춘 뒤 적용 (pageNo 경계가 어긋나지 않도록 함).
+    date_window가 있으면 해당 입찰일자 구간 (시작일, 종료일)의 페이지만 생성
+    """
+    def __init__(self, total_count, disposal_method='0001', page_size=100,
+                 min_page_size=100, max_page_size=1000, target_latency=10.0, window=8,
+                 date_window=None):
+        self.total_count = total_count
+        self.disposal_method = disposal_method
+        self.date_window = date_window
+        self.min_page_size = min_page_size
+        self.max_page_size = max(min_page_size, max_page_size)
+        self.page_size = self.fit_page_size(page_size)
+        self.target_size = self.page_size
+        self.target_latency = target_latency
+        self.window = window
+        self.samples = []
+        self.next_offset = 0
+        self.issued_pages = 0
+
+    def fit_page_size(self, page_size):
+        """
+        page_size 이하의 가장 큰 단계 크기 반환 (max_page_size 이상이면 max_page_size)
+        """
+        if page_size >= self.max_page_size:
+            return self.max_page_size
+        return self.step_size(self.min_page_size, page_size)
+
+    @staticmethod
+    def step_size(min_page_size, page_size):
+        """
+        min_page_size * 2^k 중 page_size 이하의 가장 큰 크기
+        """
+        size = min_page_size
+        while size * 2 <= page_size:
+            size *= 2
+        return size
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.next_offset >= self.total_count:
+            raise StopIteration
+
+        # 시작 위치가 맞을 때만 새 크기 적용
+        if self.target_size != self.page_size:
+            if self.next_offset % self.target_size == 0:
+                self.page_size = self.target_size
+            elif self.target_size < self.page_size:
+                # 줄이는 중: 시작 위치를 나누는 가장 큰 2^k 단계 크기로 채워 새 크기의 배수에 맞춤
+                size = self.step_size(self.min_page_size, self.target_size)
+                while self.next_offset % size:
+                    size //= 2
+                self.page_size = size
+
+        page_no = self.next_offset // self.page_size + 1
+        self.next_offset += self.page_size
+        self.issued_pages += 1
+        return (page_no, self.disposal_method, self.page_size, self.date_window)
+
+    @property
+    def total_pages(self):
+        """
+        현재 페이지 크기 기준 예상 전체 페이지 수
+        """
+        remaining = max(0, self.total_count - self.next_offset)
+        return self.issued_pages + math.ceil(remaining / self.target_size)
+
+    def record(self, page_info, elapsed, ok):
+        """
+        페이지 응답 결과 반영 (최근 window건의 평균 응답 시간/오류율로 크기 조정)
+        """
+        page_size = page_info[2]
+        if page_size != self.target_size:
+            return  # 이전 크기로 요청한 응답은 무시
+
+        self.samples.append((elapsed, ok))
+        if len(self.samples) < self.window:
+            return
+
+        error_rate = sum(1 for _, success in self.samples if not success) / len(self.samples)
+        avg_latency = sum(latency for latency, _ in self.samples) / len(self.samples)
+        self.samples = []
+
+        new_size = self.target_size
+        if error_rate > 0.2 or avg_latency > self.target_latency:
+            new_size = self.fit_page_size(max(self.min_page_size, self.target_size // 2))
+        elif error_rate == 0 and avg_latency < self.target_latency / 2 and self.target_size < self.max_page_size:
+            new_size = self.fit_page_size(self.target_size * 2)
+
+        if new_size != self.target_size:
+            old_size, self.target_size = self.target_size, new_size
+            print(f"\n페이지 크기 조정: {old_size} → {new_size} "
+                  f"(평균 응답 {avg_latency:.2f}초, 오류율 {error_rate:.0%}, 예상 페이지 {self.total_pages:,}개)")
+
+@contextmanager
+def sqlite_connection(db_path, timeout=5.0):
+    """
+    SQLite 연결을 열어 한 트랜잭션으로 실행한 뒤 닫음
+    (sqlite3 연결의 with 문은 커밋/롤백만 하고 연결을 닫지 않음)
+    """
+    conn = sqlite3.connect(db_path, timeout=timeout)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+class AuctionSyncStore:
+    """
+    이전 수집 결과를 보관하는 로컬 저장소 (SQLite)
+
+    물건번호/물건이력번호/공매조건번호를 키로, 변경 비교용 해시와 마지막 데이터를 저장.
+    순번/조회수처럼 매번 바뀌는 필드와 상세 조회 필드(DETAIL_COLUMNS)는 변경 비교에서 제외.
+    물건마다 처분방식코드와 마지막으로 수집된 조회 조건(용도/소재지, scope)을 함께 저장해
+    이번 수집 범위에 속한 물건만 종료 처리
+    """
+    KEY_FIELDS = ('물건번호', '물건이력번호', '공매조건번호')
+    VOLATILE_FIELDS = ('순번', '조회수')
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with sqlite_connection(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_items (
+                    cltr_no TEXT NOT NULL,
+                    cltr_hstr_no TEXT NOT NULL,
+                    pbct_cdtn_no TEXT NOT NULL,
+                    row_hash TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    dpsl_mtd_cd TEXT,
+                    scope TEXT NOT NULL DEFAULT '{}',
+                    PRIMARY KEY (cltr_no, cltr_hstr_no, pbct_cdtn_no)
+                )
+            """)
+            # 처분방식/조회 조건 컬럼이 없던 이전 저장소는 컬럼 추가 후 저장된 데이터로 채움
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sync_items)")}
+            if 'dpsl_mtd_cd' not in columns:
+                conn.execute("ALTER TABLE sync_items ADD COLUMN dpsl_mtd_cd TEXT")
+                conn.execute("UPDATE sync_items SET dpsl_mtd_cd = json_extract(data, '$.처분방식코드')")
+            if 'scope' not in columns:
+                conn.execute("ALTER TABLE sync_items ADD COLUMN scope TEXT NOT NULL DEFAULT '{}'")
+
+    @classmethod
+    def item_key(cls, item):
+        return tuple(str(item.get(field) or '') for field in cls.KEY_FIELDS)
+
+    def row_hash(self, item):
+        # 목록 필드만 비교 (상세 조회 필드는 조회 여부/실패에 따라 달라지므로 제외)
+        stable = {k: item.get(k) for k in ITEM_FIELDS if k not in self.VOLATILE_FIELDS}
+        return hashlib.sha1(json.dumps(stable, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def sync(self, items, retire_missing=True, methods=None, filters=None):
+        """
+        수집 결과를 저장소와 비교하여 변경분만 반영
+
+        반환: {'inserted': [...], 'updated': [...], 'retired': [...]} (각 항목은 물건 dict)
+        retire_missing=False면 이번 수집에 없는 물건을 종료 처리하지 않음 (일부 페이지 실패 시)
+        methods: 이번에 수집한 처분방식코드 목록 (None이면 전체), 다른 처분방식 물건은 종료 처리하지 않음
+        filters: 이번 수집의 용도/소재지 조건. 조건이 있으면 마지막으로 같은 조건에서 수집된 물건만
+                 종료 처리 (조건 없이 수집된 물건은 조건에 속하는지 알 수 없으므로 다음 전체 수집에서 판단)
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        delta = {'inserted': [], 'updated': [], 'retired': []}
+        scope = json.dumps(filters or {}, ensure_ascii=False, sort_keys=True)
+
+        with sqlite_connection(self.db_path) as conn:
+            existing = {
+                (cltr_no, cltr_hstr_no, pbct_cdtn_no): (row_hash, status, dpsl_mtd_cd, row_scope)
+                for cltr_no, cltr_hstr_no, pbct_cdtn_no, row_hash, status, dpsl_mtd_cd, row_scope
+                in conn.execute("""
+                    SELECT cltr_no, cltr_hstr_no, pbct_cdtn_no, row_hash, status, dpsl_mtd_cd, scope FROM sync_items
+                """)
+            }
+
+            seen = set()
+            upserts = []
+            rescoped = []  # 값은 그대로지만 다른 조회 조건에서 수집된 물건
+            for item in items:
+                key = self.item_key(item)
+                if key in seen:
+                    continue  # 수집 중 페이지 밀림으로 중복된 물건
+                seen.add(key)
+
+                row_hash = self.row_hash(item)
+                previous = existing.get(key)
+                if previous is None:
+                    delta['inserted'].append(item)
+                elif previous[0] != row_hash or previous[1] != 'active':
+                    delta['updated'].append(item)
+                else:
+                    if previous[3] != scope:
+                        rescoped.append((scope, *key))
+                    continue
+                upserts.append((*key, row_hash, json.dumps(dict(item), ensure_ascii=False, default=str), now, now,
+                                str(item.get('처분방식코드') or '') or None, scope))
+
+            conn.executemany("""
+                INSERT INTO sync_items (cltr_no, cltr_hstr_no, pbct_cdtn_no, row_hash, data, status, first_seen, updated_at,
+                                        dpsl_mtd_cd, scope)
+                VALUES (?, ?, ?, ?, ?, 'active', ?, ?, ?, ?)
+                ON CONFLICT (cltr_no, cltr_hstr_no, pbct_cdtn_no) DO UPDATE SET
+                    row_hash = excluded.row_hash,
+                    data = excluded.data,
+                    status = 'active',
+                    updated_at = excluded.updated_at,
+                    dpsl_mtd_cd = excluded.dpsl_mtd_cd,
+                    scope = excluded.scope
+            """, upserts)
+            conn.executemany("""
+                UPDATE sync_items SET scope = ?
+                WHERE cltr_no = ? AND cltr_hstr_no = ? AND pbct_cdtn_no = ?
+            """, rescoped)
+
+            if retire_missing:
+                # 이번 수집 범위(처분방식, 조회 조건)에 속하는 물건만 종료 처리
+                retired_keys = [
+                    key for key, (_, status, dpsl_mtd_cd, row_scope) in existing.items()
+                    if status == 'active' and key not in seen
+                    and (methods is None or dpsl_mtd_cd in methods)
+                    and (not filters or row_scope == scope)
+                ]
+                for key in retired_keys:
+                    row = conn.execute(
+                        "SELECT data FROM sync_items WHERE cltr_no = ? AND cltr_hstr_no = ? AND pbct_cdtn_no = ?", key
+                    ).fetchone()
+                    delta['retired'].append(json.loads(row[0]))
+                conn.executemany("""
+                    UPDATE sync_items SET status = 'retired', updated_at = ?
+                    WHERE cltr_no = ? AND cltr_hstr_no = ? AND pbct_cdtn_no = ?
+                """, [(now, *key) for key in retired_keys])
+
+        return delta
+
+class AuctionIndexStore:
+    """
+    수집한 물건을 조건 조회용으로 보관하는 로컬 저장소 (SQLite, 색인 포함)
+
+    여러 실행의 결과를 물건번호/물건이력번호/공매조건번호 기준으로 합쳐 보관 (같은 물건은 최신 값으로 갱신).
+    지번PNU/용도명/입찰마감일시/최저입찰가/물건상태에 색인이 있어 엑셀을 열지 않고 바로 조회 가능
+    예: 주거용건물 중 PNU가 1168010으로 시작하고 이번 주 마감, 최저입찰가 3억 이하
+        store.query(pnu_prefix='1168010', usage='주거용건물', closing_before=다음주, max_price=300000000)
+    """
+    KEY_FIELDS = AuctionSyncStore.KEY_FIELDS
+    INDEXED_FIELDS = ('지번PNU', '용도명', '입찰마감일시', '최저입찰가', '물건상태')
+    INTEGER_FIELDS = set(NUMERIC_COLUMNS)
+    DATETIME_FIELDS = set(DATETIME_COLUMNS)  # YYYYMMDDHH24MISS 문자열로 저장 (문자열 순서 = 시간 순서)
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        columns = ',\n'.join(
+            f'"{field}" {"INTEGER" if field in self.INTEGER_FIELDS else "TEXT"}' for field in ITEM_FIELDS
+        )
+        keys = ', '.join(f'"{field}"' for field in self.KEY_FIELDS)
+        with self.connect() as conn:
+            # WAL은 DB 파일에 유지되므로 처음 한 번만 설정 (저장 중에도 조회 가능)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS auction_items (
+                    {columns},
+                    run_id TEXT,
+                    indexed_at TEXT NOT NULL,
+                    PRIMARY KEY ({keys})
+                )
+            """)
+            for field in self.INDEXED_FIELDS:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_auction_items_{field}" ON auction_items ("{field}")')
+
+    @contextmanager
+    def connect(self):
+        with sqlite_connection(self.db_path) as conn:
+            # 대량 저장 시 디스크 동기화 횟수 감소 (연결마다 설정)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+
+    @classmethod
+    def to_db_value(cls, field, value):
+        """
+        물건 값(API 문자열 또는 DataFrame 값)을 저장할 값으로 변환, 빈 값은 NULL
+        """
+        if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and math.isnan(value)):
+            return None
+        if field in cls.INTEGER_FIELDS:
+            try:
+                return int(float(str(value).replace(',', '')))
+            except ValueError:
+                return None
+        if field in cls.DATETIME_FIELDS and isinstance(value, datetime):
+            return value.strftime('%Y%m%d%H%M%S')
+        value = str(value)
+        return value or None
+
+    @staticmethod
+    def to_db_datetime(value):
+        # datetime/date 또는 'YYYYMMDD[HHMMSS]' 문자열을 저장 형식(YYYYMMDDHH24MISS)으로 변환
+        if hasattr(value, 'strftime'):
+            return value.strftime('%Y%m%d%H%M%S')
+        return re.sub(r'\D', '', str(value)).ljust(14, '0')
+
+    def load(self, items, run_id=None):
+        """
+        물건 목록을 한 번의 트랜잭션으로 저장 (기존 물건은 갱신), 저장한 건수 반환
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = [
+            tuple(self.to_db_value(field, item.get(field)) for field in ITEM_FIELDS) + (run_id, now)
+            for item in items
+        ]
+        if not rows:
+            return 0
+        
+        names = ', '.join(f'"{field}"' for field in ITEM_FIELDS)
+        keys = ', '.join(f'"{field}"' for field in self.KEY_FIELDS)
+        updates = ',\n'.join(
+            f'"{field}" = excluded."{field}"' for field in ITEM_FIELDS + ('run_id', 'indexed_at')
+            if field not in self.KEY_FIELDS
+        )
+        with self.connect() as conn:
+            conn.executemany(f"""
+                INSERT INTO auction_items ({names}, run_id, indexed_at)
+                VALUES ({', '.join('?' * (len(ITEM_FIELDS) + 2))})
+                ON CONFLICT ({keys}) DO UPDATE SET
+                    {updates}
+            """, rows)
+        return len(rows)
+
+    def query(self, pnu_prefix=None, usage=None, closing_after=None, closing_before=None,
+              min_price=None, max_price=None, status=None, disposal_method=None,
+              order_by='입찰마감일시', limit=None):
+        """
+        조건에 맞는 물건 목록 반환 (각 항목은 물건 dict, 조건은 모두 AND)
+
+        pnu_prefix : 지번PNU 앞자리 (예: 시군구 코드 '11680')
+        usage      : 용도명 앞부분 (예: '주거용건물', '주거용건물 / 아파트')
+        closing_after/closing_before : 입찰마감일시 범위 (이상/미만, datetime 또는 'YYYYMMDD[HHMMSS]')
+        min_price/max_price : 최저입찰가 범위 (이상/이하, 원)
+        status     : 물건상태 (예: '인터넷입찰진행중')
+        order_by   : 정렬 기준 (색인된 필드 중 하나)
+        """
+        conditions, params = [], []
+        # 앞부분 일치는 범위 조건으로 바꿔 색인 사용 (LIKE는 색인을 타지 않음)
+        for field, prefix in (('지번PNU', pnu_prefix), ('용도명', usage)):
+            if prefix:
+                conditions.append(f'"{field}" >= ? AND "{field}" < ?')
+                params += [prefix, prefix + '\uffff']
+        if closing_after is not None:
+            conditions.append('"입찰마감일시" >= ?')
+            params.append(self.to_db_datetime(closing_after))
+        if closing_before is not None:
+            conditions.append('"입찰마감일시" < ?')
+            params.append(self.to_db_datetime(closing_before))
+        if min_price is not None:
+            conditions.append('"최저입찰가" >= ?')
+            params.append(int(min_price))
+        if max_price is not None:
+            conditions.append('"최저입찰가" <= ?')
+            params.append(int(max_price))
+        if status:
+            conditions.append('"물건상태" = ?')
+            params.append(status)
+        if disposal_method:
+            conditions.append('"처분방식코드" = ?')
+            params.append(disposal_method)
+        if order_by not in self.INDEXED_FIELDS:
+            raise ValueError(f"정렬 기준은 {', '.join(self.INDEXED_FIELDS)} 중 하나여야 합니다: {order_by}")
+        
+        names = ', '.join(f'"{field}"' for field in ITEM_FIELDS)
+        sql = f"SELECT {names} FROM auction_items"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f' ORDER BY "{order_by}"'
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        
+        with self.connect() as conn:
+            return [dict(zip(ITEM_FIELDS, row)) for row in conn.execute(sql, params)]
+
+    def count(self):
+        with self.connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM auction_items").fetchone()[0]
+
+class PriceHistoryStore:
+    """
+    물건관리번호별 가격/상태 이력 저장소 (SQLite)
+
+    유찰 후 재공고될 때마다 바뀌는 물건이력번호/최저입찰가/유찰횟수/물건상태를 값이 바뀐 경우에만
+    이력(price_history)에 추가하고 (추가만 함), 물건별 집계(price_summary)는 기록할 때마다 바로 갱신.
+    - 최초감정가 / 최초최저입찰가: 처음 수집했을 때 값
+    - 현재최저입찰가 / 최저가: 마지막 값 / 지금까지 가장 낮은 값
+    - 하락률: 1 - 현재최저입찰가 / 최초감정가 (감정가가 없으면 최초최저입찰가 기준)
+    - 유찰횟수: 관찰된 유찰 누적 (재공고로 유찰횟수가 다시 시작되면 이어서 합산)
+    한 번의 수집 결과 전체를 기록해야 함 (물건별 최신 공고를 골라 기록하므로, 페이지마다 나눠 기록하면
+    같은 물건의 이전 공고가 다른 페이지에 있을 때 최신 공고로 잘못 볼 수 있음).
+    저장된 공고보다 이전 물건이력번호의 행은 무시.
+    """
+    TRACKED_FIELDS = ('물건이력번호', '최저입찰가', '유찰횟수', '물건상태')
+    RECORDED_FIELDS = ('물건관리번호', '물건이력번호', '공매조건번호', '최저입찰가', '감정가', '유찰횟수',
+                       '물건상태', '물건명', '용도명', '입찰마감일시')
+    SUMMARY_LABELS = {
+        'cltr_mnmt_no': '물건관리번호',
+        'cltr_nm': '물건명',
+        'ctgr_full_nm': '용도명',
+        'first_appraisal': '최초감정가',
+        'first_min_price': '최초최저입찰가',
+        'current_min_price': '현재최저입찰가',
+        'lowest_min_price': '최저가',
+        'drop_rate': '하락률',
+        'failure_count': '유찰횟수',
+        'change_count': '변경횟수',
+        'status': '물건상태',
+        'first_seen': '최초수집',
+        'last_changed': '마지막변경',
+        'last_seen': '마지막수집'
+    }
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with sqlite_connection(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS price_history (
+                    cltr_mnmt_no TEXT NOT NULL,
+                    observed_at TEXT NOT NULL,
+                    run_id TEXT,
+                    cltr_hstr_no TEXT,
+                    min_bid_prc INTEGER,
+                    apsl_ases_avg_amt INTEGER,
+                    uscbd_cnt INTEGER,
+                    status TEXT,
+                    pbct_cls_dtm TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_price_history_cltr ON price_history (cltr_mnmt_no, observed_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS price_summary (
+                    cltr_mnmt_no TEXT PRIMARY KEY,
+                    cltr_nm TEXT,
+                    ctgr_full_nm TEXT,
+                    first_appraisal INTEGER,
+                    first_min_price INTEGER,
+                    current_min_price INTEGER,
+                    lowest_min_price INTEGER,
+                    drop_rate REAL,
+                    failure_count INTEGER NOT NULL,
+                    change_count INTEGER NOT NULL,
+                    cltr_hstr_no TEXT,
+                    uscbd_cnt INTEGER,
+                    status TEXT,
+                    first_seen TEXT NOT NULL,
+                    last_changed TEXT NOT NULL,
+                    last_seen TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_price_summary_drop ON price_summary (drop_rate)")
+
+    @staticmethod
+    def listing_order(cltr_hstr_no, pbct_cdtn_no=None):
+        """
+        같은 물건의 공고 순서 (물건이력번호, 공매조건번호, 자릿수가 달라도 숫자 순서로 비교)
+        """
+        return tuple(str(value or '').zfill(20) for value in (cltr_hstr_no, pbct_cdtn_no))
+
+    @classmethod
+    def merge_latest(cls, latest, items):
+        """
+        물건관리번호별 가장 최근 공고(물건이력번호, 공매조건번호가 가장 큰 행)만 latest에 반영
+        (기록에 필요한 필드만 보관, 한 실행의 페이지를 차례로 모을 때 사용)
+        """
+        for item in items:
+            mnmt_no = item.get('물건관리번호')
+            if not mnmt_no:
+                continue
+            previous = latest.get(mnmt_no)
+            if previous is None or (cls.listing_order(item.get('물건이력번호'), item.get('공매조건번호')) >=
+                                    cls.listing_order(previous['물건이력번호'], previous['공매조건번호'])):
+                latest[mnmt_no] = {field: item.get(field) for field in cls.RECORDED_FIELDS}
+        return latest
+
+    @classmethod
+    def latest_per_asset(cls, items):
+        """
+        물건관리번호별 가장 최근 공고만 선택
+        """
+        return cls.merge_latest({}, items)
+
+    @staticmethod
+    def drop_rate(base_price, current_price):
+        if not base_price or current_price is None:
+            return None
+        return round(1 - current_price / base_price, 4)
+
+    def record(self, items, run_id=None):
+        """
+        수집 결과를 이력에 반영 (값이 바뀐 물건만 이력 추가), 이력이 추가된 물건 수 반환
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        value = AuctionIndexStore.to_db_value
+        latest = self.latest_per_asset(items)
+        if not latest:
+            return 0
+
+        with sqlite_connection(self.db_path) as conn:
+            # 이번 수집에 나온 물건의 마지막 상태만 조회 (이력 전체를 읽지 않음)
+            previous = {}
+            keys = list(latest)
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                previous.update(
+                    (row[0], row[1:]) for row in conn.execute(f"""
+                        SELECT cltr_mnmt_no, cltr_hstr_no, current_min_price, uscbd_cnt, status,
+                               first_appraisal, first_min_price, lowest_min_price, failure_count, change_count
+                        FROM price_summary WHERE cltr_mnmt_no IN ({', '.join('?' * len(batch))})
+                    """, batch)
+                )
+
+            history, summaries, seen_only = [], [], []
+            for mnmt_no, item in latest.items():
+                state = (
+                    value('물건이력번호', item.get('물건이력번호')),
+                    value('최저입찰가', item.get('최저입찰가')),
+                    value('유찰횟수', item.get('유찰횟수')),
+                    value('물건상태', item.get('물건상태'))
+                )
+                appraisal = value('감정가', item.get('감정가'))
+                prev = previous.get(mnmt_no)
+                if prev is not None and (tuple(prev[:4]) == state or
+                                         self.listing_order(state[0]) < self.listing_order(prev[0])):
+                    # 값이 그대로이거나 저장된 공고보다 이전 공고
+                    seen_only.append((now, mnmt_no))
+                    continue
+
+                cltr_hstr_no, min_price, uscbd_cnt, status = state
+                if prev is None:
+                    first_appraisal, first_min_price = appraisal, min_price
+                    lowest, failures, changes = min_price, uscbd_cnt or 0, 0
+                else:
+                    _, _, prev_uscbd, _, first_appraisal, first_min_price, lowest, failures, changes = prev
+                    if first_appraisal is None:
+                        first_appraisal = appraisal
+                    if min_price is not None and (lowest is None or min_price < lowest):
+                        lowest = min_price
+                    # 유찰횟수가 늘면 증가분, 재공고로 다시 시작되면 새 값만큼 누적
+                    if uscbd_cnt is not None:
+                        prev_uscbd = prev_uscbd or 0
+                        failures += uscbd_cnt - prev_uscbd if uscbd_cnt >= prev_uscbd else uscbd_cnt
+                    changes += 1
+
+                history.append((mnmt_no, now, run_id, cltr_hstr_no, min_price, appraisal, uscbd_cnt, status,
+                                value('입찰마감일시', item.get('입찰마감일시'))))
+                summaries.append((
+                    mnmt_no, value('물건명', item.get('물건명')), value('용도명', item.get('용도명')),
+                    first_appraisal, first_min_price, min_price, lowest,
+                    self.drop_rate(first_appraisal or first_min_price, min_price),
+                    failures, changes, cltr_hstr_no, uscbd_cnt, status, now, now, now
+                ))
+
+            conn.executemany("""
+                INSERT INTO price_history (cltr_mnmt_no, observed_at, run_id, cltr_hstr_no, min_bid_prc,
+                                           apsl_ases_avg_amt, uscbd_cnt, status, pbct_cls_dtm)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, history)
+            conn.executemany("""
+                INSERT INTO price_summary (cltr_mnmt_no, cltr_nm, ctgr_full_nm, first_appraisal, first_min_price,
+                                           current_min_price, lowest_min_price, drop_rate, failure_count, change_count,
+                                           cltr_hstr_no, uscbd_cnt, status, first_seen, last_changed, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (cltr_mnmt_no) DO UPDATE SET
+                    cltr_nm = excluded.cltr_nm,
+                    ctgr_full_nm = excluded.ctgr_full_nm,
+                    first_appraisal = excluded.first_appraisal,
+                    current_min_price = excluded.current_min_price,
+                    lowest_min_price = excluded.lowest_min_price,
+                    drop_rate = excluded.drop_rate,
+                    failure_count = excluded.failure_count,
+                    change_count = excluded.change_count,
+                    cltr_hstr_no = excluded.cltr_hstr_no,
+                    uscbd_cnt = excluded.uscbd_cnt,
+                    status = excluded.status,
+                    last_changed = excluded.last_changed,
+                    last_seen = excluded.last_seen
+            """, summaries)
+            conn.executemany("UPDATE price_summary SET last_seen = ? WHERE cltr_mnmt_no = ?", seen_only)
+
+        return len(history)
+
+    def history(self, mnmt_no):
+        """
+        물건 하나의 가격/상태 변경 이력 (오래된 순)
+        """
+        with sqlite_connection(self.db_path) as conn:
+            rows = conn.execute("""
+                SELECT observed_at, run_id, cltr_hstr_no, min_bid_prc, apsl_ases_avg_amt, uscbd_cnt, status, pbct_cls_dtm
+                FROM price_history WHERE cltr_mnmt_no = ? ORDER BY observed_at, rowid
+            """, (mnmt_no,)).fetchall()
+        labels = ('수집일시', '실행ID', '물건이력번호', '최저입찰가', '감정가', '유찰횟수', '물건상태', '입찰마감일시')
+        return [dict(zip(labels, row)) for row in rows]
+
+    def summary(self, min_drop_rate=None, min_failures=None, limit=None):
+        """
+        물건별 집계 목록 (하락률 높은 순), 조건으로 헐값 물건만 선택 가능
+        """
+        conditions, params = [], []
+        if min_drop_rate is not None:
+            conditions.append("drop_rate >= ?")
+            params.append(min_drop_rate)
+        if min_failures is not None:
+            conditions.append("failure_count >= ?")
+            params.append(min_failures)
+        sql = f"SELECT {', '.join(self.SUMMARY_LABELS)} FROM price_summary"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY drop_rate DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with sqlite_connection(self.db_path) as conn:
+            return [dict(zip(self.SUMMARY_LABELS.values(), row)) for row in conn.execute(sql, params)]
+
+class ItemDetailStore:
+    """
+    물건 상세 조회 결과 저장소 (SQLite)
+
+    물건번호/공매번호별로 마지막 조회 결과와 그때의 물건이력번호를 보관.
+    물건이력번호가 같으면 (재공고/정보 변경이 없으면) 다시 조회하지 않고 저장된 결과 사용
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with sqlite_connection(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS item_details (
+                    cltr_no TEXT NOT NULL,
+                    pbct_no TEXT NOT NULL,
+                    cltr_hstr_no TEXT,
+                    data TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (cltr_no, pbct_no)
+                )
+            """)
+
+    def get_many(self, keys):
+        """
+        {(물건번호, 공매번호): (물건이력번호, 상세 필드 dict)} 반환 (저장된 물건만)
+        """
+        keys = set(keys)
+        cltr_nos = sorted({cltr_no for cltr_no, _ in keys})
+        found = {}
+        with sqlite_connection(self.db_path) as conn:
+            for start in range(0, len(cltr_nos), 500):
+                batch = cltr_nos[start:start + 500]
+                for cltr_no, pbct_no, cltr_hstr_no, data in conn.execute(f"""
+                    SELECT cltr_no, pbct_no, cltr_hstr_no, data FROM item_details
+                    WHERE cltr_no IN ({', '.join('?' * len(batch))})
+                """, batch):
+                    if (cltr_no, pbct_no) in keys:
+                        found[(cltr_no, pbct_no)] = (cltr_hstr_no, json.loads(data))
+        return found
+
+    def put_many(self, entries):
+        """
+        entries: {(물건번호, 공매번호): (물건이력번호, 상세 필드 dict)}
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with sqlite_connection(self.db_path) as conn:
+            conn.executemany("""
+                INSERT INTO item_details (cltr_no, pbct_no, cltr_hstr_no, data, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (cltr_no, pbct_no) DO UPDATE SET
+                    cltr_hstr_no = excluded.cltr_hstr_no,
+                    data = excluded.data,
+                    fetched_at = excluded.fetched_at
+            """, [(*key, cltr_hstr_no, json.dumps(detail, ensure_ascii=False), now)
+                  for key, (cltr_hstr_no, detail) in entries.items()])
+
+class InterleavedPagePlan:
+    """
+    여러 구간(처분방식, 입찰일자 구간)의 페이지 목록을 번갈아 꺼내는 페이지 목록
+
+    각 구간의 페이지 목록(list 또는 AdaptivePagePlan)에서 한 페이지씩 돌아가며 꺼내므로
+    하나의 요청 한도를 공유하면서 모든 구간이 함께 진행됨
+    """
+    def __init__(self, plans, feedback=True):
+        self.plans = plans  # {(처분방식코드, 입찰일자 구간): 페이지 목록}
+        self.feedback = feedback  # False면 응답 시간/오류를 반영하지 않음 (페이지 크기 고정)
+        self.iterators = [iter(plan) for plan in plans.values()]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while self.iterators:
+            iterator = self.iterators.pop(0)
+            page_info = next(iterator, None)
+            if page_info is not None:
+                self.iterators.append(iterator)
+                return page_info
+        raise StopIteration
+
+    @property
+    def total_pages(self):
+        return sum(
+            plan.total_pages if isinstance(plan, AdaptivePagePlan) else len(plan)
+            for plan in self.plans.values()
+        )
+
+    def record(self, page_info, elapsed, ok):
+        if not self.feedback:
+            return
+        plan = self.plans.get((page_info[1], page_info[3]))
+        if isinstance(plan, AdaptivePagePlan):
+            plan.record(page_info, elapsed, ok)
+
+class PageJournal:
+    """
+    완료된 페이지를 기록하는 추가 전용 저널 (JSON Lines)
+
+    첫 줄은 수집 조건(header), 이후 한 줄에 완료된 페이지 하나(페이지 번호, 크기, 파싱된 물건 목록).
+    물건은 ITEM_FIELDS 순서의 값 목록으로 기록.
+    청크 파일로 저장한 페이지는 {'chunked': [페이지 정보, ...]} 줄로 표시.
+    중단 후 --resume 시 빠진 페이지만 다시 수집하고 나머지는 저널에서 복구
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def start(self, header):
+        """
+        새 저널 시작 (기존 저널은 덮어씀)
+        """
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self.file.write(json.dumps(header, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def resume(self):
+        """
+        기존 저널 뒤에 이어서 기록
+        """
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def page_key(page_no, disposal_method, page_size, date_window):
+        return (page_no, disposal_method, page_size, tuple(date_window) if date_window else None)
+
+    def load(self):
+        """
+        저널 읽기: (header, 페이지 목록) 반환, 저널이 없으면 None
+        페이지마다 청크 파일로 저장됐는지(chunked) 표시. 마지막 줄이 기록 도중 끊긴 경우 그 줄은 무시
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        header = None
+        pages = []
+        chunked = set()
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if header is None:
+                    header = record
+                elif 'chunked' in record:
+                    chunked.update(self.page_key(*page_info) for page_info in record['chunked'])
+                else:
+                    # 값 목록으로 기록된 물건은 AuctionRecord로 (이전 형식은 dict 그대로)
+                    record['items'] = [AuctionRecord(item) if isinstance(item, list) else item
+                                       for item in record['items']]
+                    pages.append(record)
+
+        if header is None:
+            return None
+        for page in pages:
+            page['chunked'] = self.page_key(page['page'], page.get('method'), page['size'],
+                                            page.get('window')) in chunked
+        return header, pages
+
+    def mark_chunked(self, page_infos):
+        """
+        청크 파일로 저장한 페이지 표시 (수집이 끝나 저널이 닫혔으면 잠시 열어 기록)
+        """
+        if not page_infos:
+            return
+        line = json.dumps({'chunked': [list(page_info) for page_info in page_infos]}, ensure_ascii=False) + '\n'
+        if self.file:
+            self.file.write(line)
+            self.file.flush()
+        elif os.path.exists(self.path):
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def append(self, page_info, items):
+        """
+        완료된 페이지 기록
+        """
+        page_no, disposal_method, page_size, date_window = page_info
+        record = {'page': page_no, 'method': disposal_method, 'window': date_window,
+                  'size': page_size,
+                  'items': [item.data if isinstance(item, AuctionRecord) else item for item in items]}
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def missing_pages(pages, total_count, disposal_method, min_page_size, max_page_size, date_window=None):
+        """
+        저널에 없는 구간을 덮는 페이지 목록 생성
+
+        이전 실행의 페이지 크기는 모두 min_page_size의 배수이므로, 빠진 구간마다
+        시작 위치에 맞는 가장 큰 크기(min_page_size * 2^k, max_page_size 이하)로 채움
+        """
+        covered = set()
+        for page in pages:
+            start = (page['page'] - 1) * page['size']
+            covered.update(range(start // min_page_size, (start + page['size']) // min_page_size))
+
+        page_infos = []
+        block = 0
+        total_blocks = math.ceil(total_count / min_page_size)
+        while block < total_blocks:
+            if block in covered:
+                block += 1
+                continue
+
+            size = min_page_size
+            while (size * 2 <= max_page_size
+                   and (block * min_page_size) % (size * 2) == 0
+                   and not any(b in covered for b in range(block, min(block + size * 2 // min_page_size, total_blocks)))):
+                size *= 2
+
+            offset = block * min_page_size
+            page_infos.append((offset // size + 1, disposal_method, size, date_window))
+            block += size // min_page_size
+
+        return page_infos
+
+class ResponseCache:
+    """
+    API 원본 응답(XML)을 저장하는 디스크 캐시
+
+    요청 파라미터(서비스 키 제외)를 정규화한 해시를 키로 gzip 압축한 응답을 파일로 저장하고,
+    목록(SQLite)에 크기/저장 시각/마지막 사용 시각을 기록.
+    - ttl: 저장 후 이 시간(초)이 지난 응답은 사용하지 않음
+    - max_bytes: 전체 크기가 넘으면 가장 오래 사용하지 않은 응답부터 삭제 (LRU)
+    - offline: 캐시에 있는 응답만 사용 (TTL 무시, API 요청 없음)
+    """
+    def __init__(self, folder, ttl=3600, max_bytes=500 * 1024 * 1024, offline=False):
+        self.folder = folder
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.db_path = os.path.join(folder, "index.db")
+        os.makedirs(folder, exist_ok=True)
+        with sqlite_connection(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    cache_key TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def make_key(endpoint, params):
+        normalized = {k: str(v) for k, v in params.items() if k != 'serviceKey' and v is not None}
+        payload = json.dumps([endpoint, sorted(normalized.items())], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, cache_key):
+        return os.path.join(self.folder, cache_key[:2], f"{cache_key}.xml.gz")
+
+    def get(self, cache_key):
+        """
+        저장된 응답 본문 반환, 없거나 만료되었으면 None
+        """
+        now = time.time()
+        with sqlite_connection(self.db_path, timeout=30) as conn:
+            row = conn.execute(
+                "SELECT created_at FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if not self.offline and now - row[0] > self.ttl:
+                self.delete(conn, cache_key)
+                return None
+            try:
+                with gzip.open(self.path_for(cache_key), 'rb') as f:
+                    body = f.read()
+            except (OSError, EOFError):
+                self.delete(conn, cache_key)
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE cache_key = ?", (now, cache_key))
+        return body
+
+    def put(self, cache_key, body):
+        """
+        응답 본문 저장 후 크기 상한을 넘으면 오래 사용하지 않은 응답부터 삭제
+        """
+        path = self.path_for(cache_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 다른 작업자가 읽는 중에도 깨진 파일이 보이지 않도록 임시 파일에 쓴 뒤 교체
+        # (process 모드에서는 여러 프로세스가 같은 폴더를 쓰므로 프로세스 ID와 스레드 ID로 구분)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, 'wb', compresslevel=5) as f:
+            f.write(body)
+        os.replace(temp_path, path)
+        
+        now = time.time()
+        with sqlite_connection(self.db_path, timeout=30) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (cache_key, size, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (cache_key, os.path.getsize(path), now, now)
+            )
+            total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total_size > self.max_bytes:
+                for old_key, size in conn.execute(
+                    "SELECT cache_key, size FROM responses ORDER BY last_access"
+                ).fetchall():
+                    if total_size <= self.max_bytes:
+                        break
+                    self.delete(conn, old_key)
+                    total_size -= size
+
+    def delete(self, conn, cache_key):
+        conn.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+        try:
+            os.remove(self.path_for(cache_key))
+        except FileNotFoundError:
+            pass
+
+class FrameStreamWriter:
+    """
+    DataFrame 조각을 차례로 받아 하나의 파일로 저장 (.parquet, .feather, .xlsx)
+
+    조각마다 바로 파일에 기록하므로 전체 데이터를 한 번에 메모리에 올리지 않음.
+    - Parquet: 조각마다 row group 추가 (zstd 압축)
+    - Feather: Arrow IPC 파일에 조각마다 record batch 추가 (zstd 압축)
+    - 엑셀: 쓰기 전용 워크북에 행 추가 (열 너비는 첫 조각 기준, 물건관리번호에 상세URL 하이퍼링크)
+    """
+    def __init__(self, filename):
+        self.filename = os.path.abspath(filename)
+        self.rows = 0
+        self.writer = None      # Parquet/Feather 작성기
+        self.schema = None
+        self.workbook = None    # 엑셀 워크북
+        self.columns = None
+
+    def write(self, df):
+        if len(df) == 0:
+            return
+        if self.filename.endswith('.xlsx'):
+            self.write_excel(df)
+        else:
+            self.write_arrow(df)
+        self.rows += len(df)
+
+    def write_arrow(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            # 조각마다 범주 수가 달라도 같은 스키마가 되도록 범주형 인덱스는 int32로 고정
+            # (첫 조각에서 값이 모두 비어 타입을 알 수 없는 컬럼은 문자열로 지정)
+            def fixed_type(arrow_type):
+                if pa.types.is_dictionary(arrow_type):
+                    return pa.dictionary(pa.int32(), fixed_type(arrow_type.value_type))
+                return pa.string() if pa.types.is_null(arrow_type) else arrow_type
+            self.schema = pa.schema([field.with_type(fixed_type(field.type)) for field in table.schema],
+                                    metadata=table.schema.metadata)
+            if self.filename.endswith('.feather'):
+                self.sink = pa.OSFile(self.filename, 'wb')
+                self.writer = pa.ipc.new_file(self.sink, self.schema,
+                                              options=pa.ipc.IpcWriteOptions(compression='zstd'))
+            else:
+                self.writer = pq.ParquetWriter(self.filename, self.schema, compression='zstd')
+        
+        table = table.select(self.schema.names).cast(self.schema)
+        self.writer.write_table(table)
+
+    def write_excel(self, df):
+        # 상세 페이지 URL (파생 컬럼이 없으면 한 번에 계산), 시트에는 물건관리번호 하이퍼링크로만 표시
+        if DETAIL_URL_COLUMN not in df.columns:
+            df = add_detail_url(df)
+        detail_urls = df[DETAIL_URL_COLUMN].fillna('').tolist() if DETAIL_URL_COLUMN in df.columns else None
+        
+        if self.workbook is None:
+            # 존재하는 컬럼만 선택하고 순서대로 정렬
+            self.columns = [col for col in COLUMNS_ORDER if col in df.columns and col != DETAIL_URL_COLUMN]
+            
+            # 쓰기 전용(스트리밍) 모드로 엑셀 파일 생성: 행을 쓰는 즉시 디스크로 내보냄
+            self.workbook = openpyxl.Workbook(write_only=True)
+            self.worksheet = self.workbook.create_sheet('공매물건목록')
+            
+            # 열 너비: 워크시트를 다시 읽지 않고 첫 조각에서 미리 계산
+            for col_idx, col in enumerate(self.columns, 1):
+                width = max([len(col)] + [int(df[col].astype('string').fillna('').str.len().max() or 0)]) + 2
+                self.worksheet.column_dimensions[get_column_letter(col_idx)].width = width
+            
+            # 열 단위 스타일 (모든 셀이 같은 스타일 객체를 공유)
+            self.center = Alignment(horizontal='center', vertical='center')
+            self.link_font = Font(color="0000FF", underline="single")
+            self.worksheet.append([self.styled_cell(col) for col in self.columns])
+        
+        df = df.reindex(columns=self.columns)
+        
+        # 빈 값(NaN/NA/NaT)은 빈 셀로 저장
+        df = df.astype(object).where(df.notna(), None)
+        
+        # 하이퍼링크를 걸 열 위치
+        has_links = detail_urls is not None and '물건관리번호' in self.columns
+        if has_links:
+            link_target = self.columns.index('물건관리번호')
+        
+        for row_idx, values in enumerate(df.itertuples(index=False, name=None)):
+            # 빈 값은 셀을 만들지 않음
+            row = [self.styled_cell(value) if value is not None else None for value in values]
+            
+            # 하이퍼링크는 행을 쓸 때 함께 추가 (미리 계산된 상세URL 사용)
+            if has_links and row[link_target] is not None and detail_urls[row_idx]:
+                row[link_target].hyperlink = detail_urls[row_idx]
+                row[link_target].font = self.link_font
+            
+            self.worksheet.append(row)
+
+    def styled_cell(self, value):
+        cell = WriteOnlyCell(self.worksheet, value=value)
+        cell.alignment = self.center
+        return cell
+
+    def close(self):
+        if self.workbook is not None:
+            self.workbook.save(self.filename)
+            self.workbook = None
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            if self.filename.endswith('.feather'):
+                self.sink.close()
 
 class KamcoAuctionService:
-    def __init__(self, service_key):
+    def __init__(self, service_key, timeout=(5, 30), pool_size=10, output_format='parquet',
+                 cache_ttl=0, cache_max_mb=500, offline=False, max_attempts=5):
         self.base_url = "http://openapi.onbid.co.kr/openapi/services/UtlinsttPblsalThingInquireSvc"
+        self.detail_url = "http://openapi.onbid.co.kr/openapi/services/ThingInfoInquireSvc"  # 물건정보조회서비스
+        self.code_url = "http://openapi.onbid.co.kr/openapi/services/OnbidCodeInfoInquireSvc"  # 온비드코드조회
         self.service_key = service_key
+        self.timeout = timeout        # (연결 타임아웃, 응답 타임아웃) 초
+        self.pool_size = pool_size    # 세션당 유지할 커넥션 수
+        self._session_local = threading.local()
+        self.max_attempts = max_attempts  # 페이지당 최대 시도 횟수 (일시적 오류만 재시도)
+        self.metrics = PipelineMetrics()  # 단계별 지표 (수집 실행마다 새로 시작)
+        
+        # 청크/백업/최종 데이터 저장 포맷 (parquet, feather, xlsx)
+        if output_format in ('parquet', 'feather') and not HAS_PYARROW:
+            print("pyarrow가 설치되어 있지 않아 엑셀(xlsx)로 저장합니다. (pip install pyarrow)")
+            output_format = 'xlsx'
+        self.output_format = output_format
         self.backup_folder = os.path.join(os.getcwd(), "backup")
         self.data_folder = os.path.join(self.backup_folder, "data")
+        self.sync_db_path = os.path.join(self.backup_folder, "kamco_auction_sync.db")
+        self.index_db_path = os.path.join(self.backup_folder, "kamco_auction_index.db")
+        self.history_db_path = os.path.join(self.backup_folder, "kamco_auction_history.db")
+        self.details_db_path = os.path.join(self.backup_folder, "kamco_auction_details.db")
+        self.details_enabled = True   # 상세 조회 권한이 없으면(서비스 키 오류) 이번 실행에서는 건너뜀
+        self.limiter = None           # 수집 중인 실행의 요청 한도 (상세 조회도 같은 한도 사용)
+        self.detail_loop = None       # 수집 중인 실행의 상세 조회용 이벤트 루프와 작업 스레드
+        self.detail_executor = None   # (스레드별 세션/커넥션을 실행 내내 재사용)
+        self.code_table = OnbidCodeTable(self, os.path.join(self.backup_folder, "onbid_codes.json"))
+        self.journal_folder = os.path.join(self.backup_folder, "journal")
+        self.cache_folder = os.path.join(self.backup_folder, "cache")
+        self.metrics_folder = os.path.join(self.backup_folder, "metrics")
+        self.last_total_count = None
+        self.last_disposal_methods = None  # 마지막 수집의 처분방식코드 목록
+        self.last_search_filters = {}      # 마지막 수집의 용도/소재지 조건
+        self.run_id = None            # 현재(마지막) 수집 실행 ID, 청크 파일 이름에 사용
+        self.begin_date = None        # 입찰시작일 조건 (None이면 일주일 전)
+        self.search_filters = {}      # 용도/소재지 조건 (CTGR_HIRK_ID, CTGR_HIRK_ID_MID, SIDO, SGK, EMD)
         
         # 폴더 생성
-        for folder in [self.backup_folder, self.data_folder]:
+        for folder in [self.backup_folder, self.data_folder, self.journal_folder, self.metrics_folder]:
             if not os.path.exists(folder):
                 os.makedirs(folder)
                 print(f"폴더 생성: {folder}")
+        
+        # API 응답 캐시 (cache_ttl초 동안 같은 요청은 저장된 응답 사용, offline이면 캐시만 사용)
+        self.response_cache = None
+        if cache_ttl or offline:
+            self.response_cache = ResponseCache(
+                self.cache_folder,
+                ttl=cache_ttl,
+                max_bytes=cache_max_mb * 1024 * 1024,
+                offline=offline
+            )
+
+    def __getstate__(self):
+        # 세션은 프로세스/스레드마다 새로 생성 (multiprocessing 피클링 대상에서 제외)
+        # 저널은 열린 파일이고 작업 프로세스에서는 쓰지 않으므로 제외
+        state = self.__dict__.copy()
+        state.pop('_session_local', None)
+        state.pop('journal', None)
+        state.pop('detail_loop', None)
+        state.pop('detail_executor', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._session_local = threading.local()
 
-    def get_total_count(self, disposal_method='0001'):
+    def get_session(self):
         """
-        전체 데이터 개수 조회
+        현재 작업자(스레드/프로세스)가 재사용하는 HTTP 세션 반환
+
+        커넥션 풀 + keep-alive로 페이지마다 새 TCP 연결을 맺지 않도록 함
         """
-        endpoint = f"{self.base_url}/getPublicSaleObject"
-        params = {
-            'serviceKey': self.service_key,
-            'numOfRows': 1,
-            'pageNo': 1,
-            'DPSL_MTD_CD': disposal_method
-        }
+        session = getattr(self._session_local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.pool_size,
+                pool_maxsize=self.pool_size
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive'
+            })
+            self._session_local.session = session
+        return session
 
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            
-            root = ET.fromstring(response.content)
-            
-            # 결과 코드 확인
-            result_code = root.find('.//resultCode').text
-            if result_code != '00':
-                result_msg = root.find('.//resultMsg').text
-                raise Exception(f"API Error: {result_code} - {result_msg}")
-                
-            total_count = int(root.find('.//totalCount').text)
-            return total_count
-        
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request failed: {str(e)}")
-        except ET.ParseError as e:
-            raise Exception(f"XML parsing failed: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Error occurred: {str(e)}")
-        
-    def get_total_count(self, disposal_method='0001'):
+    def get_begin_date(self):
         """
-        전체 데이터 개수 조회
+        입찰시작일(PBCT_BEGN_DTM) 조건: 지정된 날짜가 없으면 일주일 전
         """
-        # 일주일 전 날짜 계산
-        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y%m%d')
+        if self.begin_date:
+            return self.begin_date
+        return (datetime.now() - timedelta(days=7)).strftime('%Y%m%d')
+
+    def get_date_params(self, date_window=None):
+        """
+        입찰일자 조건 파라미터: 구간 (시작일, 종료일)이 없으면 일주일 전부터 전체
+        종료일이 None이면 시작일 이후 전체
+        """
+        if date_window is None:
+            return {'PBCT_BEGN_DTM': self.get_begin_date()}
         
+        begin_date, end_date = date_window
+        params = {'PBCT_BEGN_DTM': begin_date}
+        if end_date:
+            params['PBCT_CLS_DTM'] = end_date
+        return params
+
+    def build_search_filters(self, category=None, region=None):
+        """
+        용도/소재지 이름을 온비드 코드표로 확인해 목록 조회 조건으로 변환 (서버에서 걸러 받음)
+        category: 용도 이름 또는 코드 (예: '주거용건물', '부동산 / 토지')
+        region: 시도 또는 (시도, 시군구[, 읍면동]) (예: '서울특별시', ('서울특별시', '강남구'))
+        """
+        filters = {}
+        if category:
+            filters.update(self.code_table.category_filter(category))
+        if region:
+            filters.update(self.code_table.region_filter(*([region] if isinstance(region, str) else region)))
+        return filters
+
+    def get_code_items(self, operation, **params):
+        """
+        온비드코드조회 목록 (전체 페이지): 항목별 {태그: 값} 목록 반환
+        일시적 오류는 대기 후 max_attempts번까지 재시도
+        """
+        endpoint = f"{self.code_url}/{operation}"
+        items = []
+        page_no = 1
+        while True:
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    response = self.get_session().get(endpoint, timeout=self.timeout, params={
+                        'serviceKey': self.service_key, 'numOfRows': 100, 'pageNo': page_no, **params
+                    })
+                    response.raise_for_status()
+                    root = ET.fromstring(response.content)
+                    result_code = root.findtext('.//resultCode')
+                    self.metrics.inc('onbid_api_results_total', result_code=result_code or 'none', service='code')
+                    if result_code not in ('00', NODATA_RESULT_CODE):
+                        raise OnbidApiError(f"API Error: {result_code} - {root.findtext('.//resultMsg')}",
+                                            result_code, retryable=result_code in RETRYABLE_RESULT_CODES)
+                    break
+                except (requests.exceptions.RequestException, ET.ParseError) as e:
+                    error = OnbidApiError(f"Request failed: {str(e)}")
+                except OnbidApiError as e:
+                    error = e
+                if not error.retryable or attempt == self.max_attempts:
+                    raise error
+                self.metrics.inc('onbid_retries_total', reason=self.retry_reason(error))
+                time.sleep(backoff_delay(attempt))
+            
+            page = [{child.tag: child.text for child in item} for item in root.iter('item')]
+            items.extend(page)
+            total_count = int(root.findtext('.//totalCount') or root.findtext('.//TotalCount') or 0)
+            if not page or len(items) >= total_count:
+                return items
+            page_no += 1
+
+    def get_total_count(self, disposal_method='0001', date_window=None):
+        """
+        전체 데이터 개수 조회 (1건짜리 페이지 요청)
+
+        수집은 get_first_page로 건수와 1페이지를 한 번에 받으므로 이 메서드를 쓰지 않음
+        """
+        total_count, _ = self.get_auction_page(num_of_rows=1, page_no=1,
+                                               disposal_method=disposal_method, date_window=date_window)
+        return total_count
+
+    def get_auction_items(self, num_of_rows=100, page_no=1, disposal_method='0001', date_window=None,
+                          category=None, region=None):
+        """
+        공매물건 목록 조회
+
+        category/region을 지정하면 해당 용도/소재지 물건만 서버에서 걸러 받음 (build_search_filters 참고),
+        지정하지 않으면 실행 조건(self.search_filters) 사용
+        """
+        filters = self.build_search_filters(category, region) if category or region else None
+        return self.get_auction_page(num_of_rows, page_no, disposal_method, date_window, filters)[1]
+
+    def get_auction_page(self, num_of_rows=100, page_no=1, disposal_method='0001', date_window=None, filters=None):
+        """
+        공매물건 목록 조회: (전체 건수, 물건 목록) 반환
+
+        응답 캐시를 사용하면 같은 요청은 저장된 원본 응답을 다시 파싱
+        filters: 용도/소재지 조건 (None이면 self.search_filters)
+        """
+        filters = self.search_filters if filters is None else filters
         endpoint = f"{self.base_url}/getPublicSaleObject"
         params = {
             'serviceKey': self.service_key,
-            'numOfRows': 1,
-            'pageNo': 1,
+            'numOfRows': num_of_rows,
+            'pageNo': page_no,
             'DPSL_MTD_CD': disposal_method,
-            'PBCT_BEGN_DTM': week_ago  # 일주일 전 날짜 추가
+            **self.get_date_params(date_window),  # 입찰일자 조건
+            **filters                             # 용도/소재지 조건
         }
 
+        metrics = self.metrics
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
+            cache = self.response_cache
+            cache_key = cache.make_key(endpoint, params) if cache else None
+            body = cache.get(cache_key) if cache else None
             
-            root = ET.fromstring(response.content)
+            if body is not None:
+                metrics.inc('onbid_requests_total', source='cache')
+                with metrics.timer('parse'):
+                    header, items = parse_auction_response([body])
+            elif cache and cache.offline:
+                raise OnbidApiError(f"오프라인 모드: 캐시에 없는 요청입니다 (페이지 {page_no}, 크기 {num_of_rows})",
+                                    retryable=False)
+            else:
+                metrics.inc('onbid_requests_total', source='network')
+                started = time.perf_counter()
+                response = self.get_session().get(endpoint, params=params, timeout=self.timeout, stream=True)
+                with response:
+                    response.raise_for_status()
+                    
+                    # 응답을 받는 대로 스트리밍 파싱 (캐시를 쓰면 원본도 함께 보관)
+                    received = []
+                    waited = [time.perf_counter() - started]  # 응답을 기다린 시간 (나머지는 파싱 시간)
+                    chunks = self.timed_chunks(response.iter_content(chunk_size=64 * 1024), waited)
+                    if cache:
+                        chunks = (received.append(chunk) or chunk for chunk in chunks)
+                    header, items = parse_auction_response(chunks)
+                metrics.observe('onbid_stage_seconds', waited[0], stage='request')
+                metrics.observe('onbid_stage_seconds', time.perf_counter() - started - waited[0], stage='parse')
             
             # 결과 코드 확인
-            result_code = root.find('.//resultCode').text
+            result_code = header.get('resultCode')
+            metrics.inc('onbid_api_results_total', result_code=result_code or 'none')
+            if result_code == NODATA_RESULT_CODE:
+                return 0, []
             if result_code != '00':
-                result_msg = root.find('.//resultMsg').text
-                raise Exception(f"API Error: {result_code} - {result_msg}")
-                
-            total_count = int(root.find('.//totalCount').text)
-            return total_count
-        
+                result_msg = header.get('resultMsg')
+                raise OnbidApiError(f"API Error: {result_code} - {result_msg}", result_code,
+                                    retryable=result_code in RETRYABLE_RESULT_CODES)
+            
+            # 정상 응답만 캐시에 저장
+            if cache and body is None:
+                cache.put(cache_key, b''.join(received))
+            
+            total_count = int(header.get('totalCount') or 0)
+            return total_count, items
+
+        except OnbidApiError:
+            raise
+        except requests.exceptions.HTTPError as e:
+            # 4xx는 다시 보내도 같은 결과 (429 요청 과다 제외)
+            status = e.response.status_code if e.response is not None else None
+            metrics.inc('onbid_api_results_total', result_code=f'http_{status}')
+            raise OnbidApiError(f"Request failed: {str(e)}",
+                                retryable=status is None or status >= 500 or status == 429)
         except requests.exceptions.RequestException as e:
-            raise Exception(f"Request failed: {str(e)}")
+            metrics.inc('onbid_api_results_total', result_code='network_error')
+            raise OnbidApiError(f"Request failed: {str(e)}")
         except ET.ParseError as e:
-            raise Exception(f"XML parsing failed: {str(e)}")
+            raise OnbidApiError(f"XML parsing failed: {str(e)}")
         except Exception as e:
-            raise Exception(f"Error occurred: {str(e)}")
+            raise OnbidApiError(f"Error occurred: {str(e)}")
 
-    def get_auction_items(self, num_of_rows=100, page_no=1, disposal_method='0001'):
+    @staticmethod
+    def timed_chunks(chunks, waited):
         """
-        공매물건 목록 조회
+        응답 조각을 그대로 넘기면서 조각을 기다린 시간을 waited[0]에 더함
         """
-        # 일주일 전 날짜 계산
-        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y%m%d')
+        chunks = iter(chunks)
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            waited[0] += time.perf_counter() - started
+            if chunk is None:
+                return
+            yield chunk
 
-        endpoint = f"{self.base_url}/getPublicSaleObject"
-        params = {
-            'serviceKey': self.service_key,
-            'numOfRows': num_of_rows,
-            'pageNo': page_no,
-            'DPSL_MTD_CD': disposal_method,
-            'PBCT_BEGN_DTM': week_ago  # 일주일 전 날짜 추가
+    def retry_reason(self, error):
+        return error.result_code or 'network'
+
+    def get_first_page(self, disposal_method='0001', date_window=None, page_size=1000, min_page_size=100,
+                       limiter=None):
+        """
+        1페이지 조회: (전체 건수, 물건 목록, 서비스가 허용하는 최대 페이지 크기) 반환
 
+        건수 확인과 페이지 크기 확인을 1페이지 요청 하나로 처리하고, 받은 행은 그대로 첫 페이지로 사용.
+        요청이 실패하면(타임아웃 등) 크기를 min_page_size * 2^k 단계로 절반 이하로 줄여 다시 시도하고,
+        요청보다 적게 오면 그 건수(min_page_size 배수로 내림)가 서비스 상한.
+        서비스가 일시적 오류 코드(요청 한도 초과 등)를 돌려주면 크기는 그대로 두고
+        대기 시간을 늘려 가며 max_attempts번까지 시도.
+        limiter(TokenBucket)를 주면 다시 시도하는 요청까지 모두 그 요청 한도 안에서 보냄
+        """
+        attempt = 0
+        while True:
+            if limiter is not None:
+                time.sleep(limiter.reserve())
+            try:
+                total_count, items = self.get_auction_page(page_size, 1, disposal_method, date_window)
+                break
+            except OnbidApiError as e:
+                if e.fatal:
+                    raise
+                if page_size > min_page_size and (e.result_code is None or not e.retryable):
+                    print(f"\n페이지 크기 {page_size} 확인 실패: {str(e)}")
+                    page_size = AdaptivePagePlan.step_size(min_page_size, max(min_page_size, page_size // 2))
+                    continue
+                attempt += 1
+                if not e.retryable or attempt >= self.max_attempts:
+                    raise
+                self.metrics.inc('onbid_retries_total', reason=self.retry_reason(e))
+                time.sleep(backoff_delay(attempt))
+        
+        if len(items) < min(page_size, total_count):
+            # 서비스 상한을 min_page_size 배수로 내림 (모든 페이지 크기가 min_page_size의 배수가 되도록)
+            page_size = max(min_page_size, len(items) // min_page_size * min_page_size)
+        return total_count, items, page_size
+
+    def get_item_detail(self, cltr_no, pbct_no):
+        """
+        물건 상세 조회 (통합용도별물건 기본정보 상세조회): 상세 필드 dict 반환
+        """
+        endpoint = f"{self.detail_url}/getUnifyUsageCltrBasicInfoDetail"
+        params = {
+            'serviceKey': self.service_key,
+            'CLTR_NO': cltr_no,
+            'PBCT_NO': pbct_no
         }
-
+        
+        metrics = self.metrics
         try:
-            response = requests.get(endpoint, params=params)
+            metrics.inc('onbid_detail_requests_total')
+            started = time.perf_counter()
+            response = self.get_session().get(endpoint, params=params, timeout=self.timeout)
             response.raise_for_status()
+            metrics.observe('onbid_stage_seconds', time.perf_counter() - started, stage='detail_request')
             
-            root = ET.fromstring(response.content)
-            
-            # 결과 코드 확인
-            result_code = root.find('.//resultCode').text
+            header, detail = parse_detail_response(response.content)
+            result_code = header.get('resultCode')
+            metrics.inc('onbid_api_results_total', result_code=result_code or 'none', service='detail')
+            if result_code == NODATA_RESULT_CODE:
+                return {}
             if result_code != '00':
-                result_msg = root.find('.//resultMsg').text
-                raise Exception(f"API Error: {result_code} - {result_msg}")
-
-            items = []
-            for item in root.findall('.//item'):
-                item_data = self.get_item_data(item)
-                items.append(item_data)
-                
-            return items
-
+                raise OnbidApiError(f"API Error: {result_code} - {header.get('resultMsg')}", result_code,
+                                    retryable=result_code in RETRYABLE_RESULT_CODES)
+            return detail
+        
+        except OnbidApiError:
+            raise
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            raise OnbidApiError(f"Request failed: {str(e)}",
+                                retryable=status is None or status >= 500 or status == 429)
         except requests.exceptions.RequestException as e:
-            raise Exception(f"Request failed: {str(e)}")
+            raise OnbidApiError(f"Request failed: {str(e)}")
         except ET.ParseError as e:
-            raise Exception(f"XML parsing failed: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Error occurred: {str(e)}")
+            raise OnbidApiError(f"XML parsing failed: {str(e)}")
 
-    def get_item_data(self, item):
+    def fetch_item_details(self, items, max_in_flight=8, requests_per_second=5.0):
         """
-        XML 항목에서 모든 데이터 추출하여 한글 필드명으로 변환
+        물건 목록의 상세 정보 조회: {(물건번호, 공매번호): 상세 필드 dict} 반환
+
+        저장소에 있고 물건이력번호가 같은 물건은 다시 조회하지 않음. 나머지는 동시 요청 max_in_flight개,
+        초당 requests_per_second건으로 조회 후 저장 (수집 중이면 목록 수집과 요청 한도를 나눠 씀).
+        끝내 실패한 물건은 결과에서 빠짐 (다음 실행에서 다시 조회)
         """
-        # 영문-한글 필드 매핑
-        field_mapping = {
-            'RNUM': '순번',
-            'PLNM_NO': '공고번호',
-            'PBCT_NO': '공매번호',
-            'PBCT_CDTN_NO': '공매조건번호',
-            'CLTR_NO': '물건번호',
-            'CLTR_HSTR_NO': '물건이력번호',
-            'SCRN_GRP_CD': '화면그룹코드',
-            'CTGR_FULL_NM': '용도명',
-            'BID_MNMT_NO': '입찰번호',
-            'CLTR_NM': '물건명',
-            'CLTR_MNMT_NO': '물건관리번호',
-            'LDNM_ADRS': '물건소재지(지번)',
-            'NMRD_ADRS': '물건소재지(도로명)',
-            'LDNM_PNU': '지번PNU',
-            'DPSL_MTD_CD': '처분방식코드',
-            'DPSL_MTD_NM': '처분방식코드명',
-            'BID_MTD_NM': '입찰방식명',
-            'MIN_BID_PRC': '최저입찰가',
-            'APSL_ASES_AVG_AMT': '감정가',
-            'FEE_RATE': '최저입찰가율',
-            'PBCT_BEGN_DTM': '입찰시작일시',
-            'PBCT_CLS_DTM': '입찰마감일시',
-            'PBCT_CLTR_STAT_NM': '물건상태',
-            'USCBD_CNT': '유찰횟수',
-            'IQRY_CNT': '조회수',
-            'GOODS_NM': '물건상세정보',
-            'MANF': '제조사',
-            'MDL': '모델',
-            'NRGT': '연월식',
-            'GRBX': '변속기',
-            'ENDPC': '배기량',
-            'VHCL_MLGE': '주행거리',
-            'FUEL': '연료',
-            'SCRT_NM': '법인명',
-            'TPBZ': '업종',
-            'ITM_NM': '종목명',
-            'MMB_RGT_NM': '회원권명',
-            'CLTR_IMG_FILE': '물건 이미지'
+        wanted = {}
+        for item in items:
+            key = (str(item.get('물건번호') or ''), str(item.get('공매번호') or ''))
+            if all(key):
+                wanted[key] = str(item.get('물건이력번호') or '')
+        if not wanted:
+            return {}
+        
+        store = ItemDetailStore(self.details_db_path)
+        details = {
+            key: detail for key, (cltr_hstr_no, detail) in store.get_many(wanted).items()
+            if cltr_hstr_no == wanted[key]
         }
-
-        # XML 데이터 추출 및 한글 필드명으로 변환
-        data = {}
-        for eng_field, kor_field in field_mapping.items():
-            value = item.find(eng_field)
-            data[kor_field] = value.text if value is not None else ''
+        self.metrics.inc('onbid_detail_cache_hits_total', len(details))
+        missing = [key for key in wanted if key not in details]
+        if not missing or not self.details_enabled:
+            return details
         
-        return data
+        with self.metrics.timer('detail'):
+            if self.detail_loop is not None:
+                # 수집 중이면 실행 내내 같은 루프/작업 스레드 사용 (스레드별 세션의 커넥션 재사용)
+                fetched = self.detail_loop.run_until_complete(
+                    self.fetch_details_async(missing, self.detail_executor, max_in_flight, requests_per_second)
+                )
+            else:
+                with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+                    fetched = asyncio.run(
+                        self.fetch_details_async(missing, executor, max_in_flight, requests_per_second)
+                    )
+        store.put_many({key: (wanted[key], detail) for key, detail in fetched.items()})
+        details.update(fetched)
+        return details
 
-    def fetch_page_data(self, page_info):
+    async def fetch_details_async(self, keys, executor, max_in_flight=8, requests_per_second=5.0):
         """
-        단일 페이지 데이터 수집 (병렬 처리용)
+        상세 조회를 비동기로 동시에 수행 (요청 속도 제한, 일시적 오류는 대기 후 재시도)
+        요청은 executor의 작업 스레드에서 보냄 (스레드별 HTTP 세션 사용)
+        서비스 키 오류(상세 조회 권한 없음 등)가 나면 남은 조회를 멈추고 이번 실행에서는 상세 조회를 건너뜀
         """
-        page_no, disposal_method, items_per_page = page_info
+        loop = asyncio.get_running_loop()
+        limiter = self.limiter or TokenBucket(requests_per_second)
+        breaker = CircuitBreaker()
+        pending = deque(keys)
+        results = {}
         
-        for attempt in range(3):  # 재시도 횟수
-            try:
-                time.sleep(0.5)  # API 호출 간격
-                items = self.get_auction_items(
-                    num_of_rows=items_per_page,
-                    page_no=page_no,
-                    disposal_method=disposal_method
-                )
-                return items
-            except Exception as e:
-                if attempt == 2:  # 마지막 시도
-                    print(f"\n페이지 {page_no} 처리 실패: {str(e)}")
-                    return []
-                time.sleep(2)  # 재시도 전 대기
-        return []
+        async def worker():
+            while pending and self.details_enabled:
+                key = pending.popleft()
+                for attempt in range(self.max_attempts):
+                    probe = await breaker.wait()
+                    try:
+                        if not self.details_enabled:
+                            return
+                        await limiter.acquire()
+                        results[key] = await loop.run_in_executor(executor, self.get_item_detail, *key)
+                        breaker.record_success()
+                        break
+                    except OnbidApiError as e:
+                        if e.fatal:
+                            if self.details_enabled:
+                                print(f"\n상세 조회를 사용할 수 없어 건너뜁니다: {str(e)}")
+                            self.details_enabled = False
+                            return
+                        if e.retryable:
+                            breaker.record_failure()
+                        if not e.retryable or attempt == self.max_attempts - 1:
+                            self.metrics.inc('onbid_detail_failures_total')
+                            break
+                        self.metrics.inc('onbid_retries_total', reason=self.retry_reason(e))
+                    finally:
+                        if probe:
+                            breaker.release()
+                    await asyncio.sleep(backoff_delay(attempt + 1))
+        
+        await asyncio.gather(*(worker() for _ in range(max_in_flight)))
+        return results
+
+    def get_item_data(self, item):
+        """
+        XML 항목에서 모든 데이터 추출하여 한글 필드명으로 변환
+        """
+        return parse_item_element(item)
+
+    def save_data(self, items, filename):
+        """
+        확장자에 맞는 포맷으로 데이터 저장 (.parquet, .feather, .xlsx)
+        """
+        if filename.endswith('.xlsx'):
+            self.save_data_to_excel(items, filename, is_backup=True)
+        else:
+            self.save_data_to_columnar(items, filename)
+
+    def save_data_to_columnar(self, items, filename):
+        """
+        데이터를 컬럼형 파일(Parquet/Feather)로 저장 (컬럼 타입 지정, zstd 압축)
+        """
+        if len(items) == 0:
+            print("저장할 데이터가 없습니다.")
+            return
+            
+        try:
+            abs_filename = os.path.abspath(filename)
+            df = build_dataframe(items)
+            
+            if abs_filename.endswith('.feather'):
+                df.to_feather(abs_filename, compression='zstd')
+            else:
+                df.to_parquet(abs_filename, index=False, compression='zstd')
+            
+            print(f"파일 저장 완료: {abs_filename}")
+            
+        except Exception as e:
+            print(f"파일 저장 중 오류 발생: {str(e)}")
+            raise
+
+    def read_data_file(self, file_path):
+        """
+        저장된 데이터 파일 읽기 (.parquet, .feather, .xlsx)
+        """
+        if file_path.endswith('.parquet'):
+            return pd.read_parquet(file_path)
+        if file_path.endswith('.feather'):
+            return pd.read_feather(file_path)
+        return pd.read_excel(file_path)
 
     def save_data_to_excel(self, items, filename, is_backup=False):
         """
         데이터를 엑셀 파일로 저장
         """
-        if not items:
+        if len(items) == 0:
             print("저장할 데이터가 없습니다.")
             return
             
@@ -242,93 +2423,9 @@ class KamcoAuctionService:
             abs_filename = os.path.abspath(filename)
             print(f"파일 저장 시도: {abs_filename}")
             
-            df = pd.DataFrame(items)
-
-            # 헤더 순서 정의
-            columns_order = [
-                '순번',
-                '물건관리번호',
-                '용도명',
-                '물건명',
-                '물건소재지(지번)',
-                '지번PNU',
-                '물건소재지(도로명)',
-                '입찰방식명',
-                '감정가',
-                '최저입찰가',
-                '최저입찰가율',
-                '입찰시작일시',
-                '입찰마감일시',
-                '물건상태',
-                '유찰횟수',
-                '조회수',
-                '물건상세정보',
-                '공고번호',
-                '공매번호',
-                '공매조건번호',
-                '물건번호',
-                '물건이력번호',
-                '화면그룹코드',
-                '입찰번호',
-                '처분방식코드',
-                '처분방식코드명',
-                '제조사',
-                '모델',
-                '연월식',
-                '변속기',
-                '배기량',
-                '주행거리',
-                '연료',
-                '법인명',
-                '업종',
-                '종목명',
-                '회원권명',
-                '물건 이미지'
-            ]
-            
-            # 존재하는 컬럼만 선택하고 순서대로 정렬
-            existing_columns = [col for col in columns_order if col in df.columns]
-            df = df[existing_columns]
-            
-            # 엑셀 파일 생성
-            with pd.ExcelWriter(abs_filename, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='공매물건목록')
-                
-                # 워크시트 가져오기
-                worksheet = writer.sheets['공매물건목록']
-                
-                # 스타일 설정
-                for row in worksheet.iter_rows():
-                    for cell in row:
-                        cell.alignment = Alignment(horizontal='center', vertical='center')
-                
-                # 열 너비 자동 조정
-                for column in worksheet.columns:
-                    max_length = 0
-                    column = list(column)
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = (max_length + 2)
-                    worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
-
-                # 하이퍼링크 추가
-                for row in range(2, worksheet.max_row + 1):  # 2부터 시작 (헤더 제외)
-                    cltr_hstr_no = worksheet.cell(row=row, column=existing_columns.index('물건이력번호') + 1).value
-                    cltr_no = worksheet.cell(row=row, column=existing_columns.index('물건번호') + 1).value
-                    plnm_no = worksheet.cell(row=row, column=existing_columns.index('공고번호') + 1).value
-                    pbct_no = worksheet.cell(row=row, column=existing_columns.index('공매번호') + 1).value
-                    scrn_grp_cd = worksheet.cell(row=row, column=existing_columns.index('화면그룹코드') + 1).value
-                    pbct_cdtn_no = worksheet.cell(row=row, column=existing_columns.index('공매조건번호') + 1).value
-
-                    if all([cltr_hstr_no, cltr_no, plnm_no, pbct_no, scrn_grp_cd, pbct_cdtn_no]):
-                        url = f"https://www.onbid.co.kr/op/cta/cltrdtl/collateralDetailMoveableAssetsDetail.do?cltrHstrNo={cltr_hstr_no}&cltrNo={cltr_no}&plnmNo={plnm_no}&pbctNo={pbct_no}&scrnGrpCd={scrn_grp_cd}&pbctCdtnNo={pbct_cdtn_no}"
-                        cell = worksheet.cell(row=row, column=existing_columns.index('물건관리번호') + 1)
-                        cell.hyperlink = url
-                        cell.font = Font(color="0000FF", underline="single")
+            writer = FrameStreamWriter(abs_filename)
+            writer.write(items if isinstance(items, pd.DataFrame) else pd.DataFrame(items))
+            writer.close()
             
             print(f"파일 저장 완료: {abs_filename}")
             
@@ -346,208 +2443,1081 @@ class KamcoAuctionService:
         
         try:
             current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-            chunk_filename = os.path.join(
-                self.data_folder,
-                f"kamco_auction_chunk_{chunk_number}_of_{total_chunks}_{current_time}.xlsx"
-            )
+            name = f"kamco_auction_chunk_{self.run_id}_{chunk_number}_of_{total_chunks}_{current_time}"
+            chunk_filename = os.path.join(self.data_folder, f"{name}.{self.output_format}")
+            # 같은 이름의 청크 파일이 있으면 덮어쓰지 않고 번호를 붙임
+            suffix = 1
+            while os.path.exists(chunk_filename):
+                suffix += 1
+                chunk_filename = os.path.join(self.data_folder, f"{name}_{suffix}.{self.output_format}")
             
             print(f"청크 데이터 저장 시도: {chunk_filename}")
-            self.save_data_to_excel(chunk_data, chunk_filename, is_backup=True)
+            self.save_data(chunk_data, chunk_filename)
             print(f"청크 데이터 저장 완료: {chunk_filename} ({len(chunk_data):,}건)")
             
         except Exception as e:
             print(f"청크 저장 중 오류 발생: {str(e)}")
             raise
 
-    def merge_chunk_files(self):
+    def list_chunk_files(self, run_id):
         """
-        청크 파일들을 하나로 병합
+        실행(run_id)의 청크 파일 목록: [(청크 번호, 파일 이름)] (청크 번호 순)
         """
-        try:
-            all_data = []
-            chunk_files = [f for f in os.listdir(self.data_folder) if f.startswith("kamco_auction_chunk_")]
+        prefix = f"kamco_auction_chunk_{run_id}_"
+        chunks = []
+        for f in os.listdir(self.data_folder):
+            number = f[len(prefix):].split('_')[0] if f.startswith(prefix) else ''
+            if number.isdigit():
+                chunks.append((int(number), f))
+        return sorted(chunks)
+
+    def iter_pages_pool(self, page_infos, requests_per_second=5.0, limiter=None):
+        """
+        multiprocessing 기반 페이지 수집 (완료되는 순서대로 (페이지 정보, 물건 목록) 반환)
+
+        작업 프로세스는 페이지를 한 번씩만 요청하고, 요청 시점은 부모 프로세스가 정함:
+        - 전체 요청 속도: limiter (목록 수집과 상세 조회가 공유하는 토큰 버킷)
+        - 일시적 오류는 비동기 수집과 같이 지수 증가 + 무작위 대기 후 재시도, 연속 실패 시 회로 차단기로 요청 중단
+        - 재시도 후에도 실패한 페이지는 마지막에 동시 요청 1개로 다시 수집, 그래도 실패하면 물건 목록 None 반환
+        """
+        # CPU 코어 수 제한 (4개만 사용)
+        num_processes = min(4, cpu_count())
+        print(f"\n{num_processes}개의 프로세스로 병렬 처리 시작")
+
+        limiter = limiter or TokenBucket(requests_per_second)
+        breaker = CircuitBreaker()
+        dead_letters = []  # 재시도 후에도 실패한 페이지 (마지막에 한 번 더 수집)
+        with Pool(processes=num_processes) as pool:
+            yield from self.run_pool_pass(pool, page_infos, limiter, breaker, num_processes, dead_letters)
             
-            print(f"\n병합할 청크 파일 수: {len(chunk_files)}")
+            if dead_letters:
+                print(f"\n실패한 페이지 {len(dead_letters)}개 다시 수집")
+                yield from self.run_pool_pass(pool, dead_letters, limiter, breaker, 1, None)
+
+    def run_pool_pass(self, pool, page_infos, limiter, breaker, workers, dead_letters):
+        """
+        iter_pages_pool의 수집 한 차례 (동시 요청 workers개): 끝내 실패한 페이지는 dead_letters에 추가
+        (dead_letters가 None이면 마지막 차례이므로 (페이지 정보, None) 반환)
+        """
+        page_iter = iter(page_infos)
+        retries = []          # (재시도 가능 시각, 시도 횟수, 페이지 정보)
+        in_flight = deque()   # (페이지 정보, 시도 횟수, 상태 확인 요청 여부, 작업 결과)
+
+        def next_page():
+            now = time.monotonic()
+            ready = [entry for entry in retries if entry[0] <= now]
+            if ready:
+                retries.remove(ready[0])
+                return ready[0][1], ready[0][2]
+            page_info = next(page_iter, None)
+            return None if page_info is None else (0, page_info)
+
+        while True:
+            # 동시 요청 수만큼 요청 (회로가 열려 있으면 응답을 기다리거나 대기)
+            while len(in_flight) < workers:
+                job = next_page()
+                if job is None:
+                    break
+                delay, probe = breaker.try_acquire()
+                if delay:
+                    retries.append((time.monotonic(), *job))
+                    if in_flight:
+                        break
+                    time.sleep(delay)
+                    continue
+                time.sleep(limiter.reserve())
+                in_flight.append((job[1], job[0], probe, pool.apply_async(self.fetch_page_data, (job[1],))))
+
+            if not in_flight:
+                if not retries:
+                    return
+                # 재시도 대기 중인 페이지만 남음
+                time.sleep(max(0, min(entry[0] for entry in retries) - time.monotonic()))
+                continue
+
+            page_info, attempt, probe, result = in_flight.popleft()
+            try:
+                items, error, metrics = result.get()
+                # 작업 프로세스의 지표는 결과와 함께 받아 합산
+                self.metrics.merge(metrics)
+                if error is None:
+                    breaker.record_success()
+                elif error.fatal:
+                    raise error
+                elif error.retryable:
+                    breaker.record_failure()
+            finally:
+                if probe:
+                    breaker.release()
+
+            if error is None:
+                yield page_info, items
+            elif error.retryable and attempt < self.max_attempts - 1:
+                # 재시도 전 대기 (대기 중에도 다른 페이지는 계속 수집)
+                self.metrics.inc('onbid_retries_total', reason=self.retry_reason(error))
+                retries.append((time.monotonic() + backoff_delay(attempt + 1), attempt + 1, page_info))
+            elif dead_letters is not None:
+                self.metrics.inc('onbid_dead_letters_total')
+                dead_letters.append(page_info)
+            else:
+                print(f"\n페이지 {page_info[0]} 처리 실패: {str(error)}")
+                self.metrics.inc('onbid_failed_pages_total')
+                yield page_info, None
+
+    def iter_pages_async(self, page_infos, max_in_flight=8, requests_per_second=5.0, limiter=None):
+        """
+        asyncio 기반 페이지 수집 (완료되는 순서대로 (페이지 정보, 물건 목록) 반환)
+
+        이벤트 루프는 별도 스레드에서 실행되고, 결과는 큐를 통해 전달됨.
+        호출 측 루프(청크 저장, 백업 등)는 기존과 동일하게 동기 방식으로 동작.
+        큐는 max_in_flight * 2페이지까지만 담고, 가득 차면 호출 측이 꺼낼 때까지 요청을 멈춤
+        (호출 측 처리가 느려도 메모리는 동시에 받는 페이지 수만큼만 사용)
+        """
+        result_queue = queue.Queue(maxsize=max_in_flight * 2)
+        stop_event = threading.Event()
+        finished = object()
+
+        def put(result):
+            # 호출 측이 멈추면(stop_event) 더 전달하지 않음
+            while not stop_event.is_set():
+                try:
+                    result_queue.put(result, timeout=0.5)
+                    return
+                except queue.Full:
+                    pass
+
+        def run_loop():
+            try:
+                asyncio.run(self.fetch_pages_async(
+                    page_infos, result_queue, stop_event,
+                    max_in_flight=max_in_flight,
+                    requests_per_second=requests_per_second,
+                    limiter=limiter
+                ))
+            except BaseException as e:
+                put(e)
+            finally:
+                put(finished)
+
+        worker = threading.Thread(target=run_loop, daemon=True)
+        worker.start()
+
+        try:
+            while True:
+                result = result_queue.get()
+                if result is finished:
+                    break
+                if isinstance(result, BaseException):
+                    raise result
+                yield result
+        finally:
+            # 중단 시 대기 중인 페이지 요청 취소
+            stop_event.set()
+
+    async def fetch_pages_async(self, page_infos, result_queue, stop_event,
+                                max_in_flight=8, requests_per_second=5.0, limiter=None):
+        """
+        페이지 목록을 비동기로 수집하여 (페이지 정보, 물건 목록)을 result_queue에 전달
+        (result_queue가 가득 차면 빈자리가 날 때까지 작업 코루틴이 다음 요청을 보내지 않음)
+
+        - 동시 요청 수: max_in_flight (작업 코루틴 수)
+        - 전체 요청 속도: limiter (모든 요청이 공유하는 토큰 버킷)
+        - page_infos는 필요할 때마다 하나씩 꺼내 씀 (AdaptivePagePlan이면 응답 시간/오류를 피드백)
+        - 일시적 오류는 지수 증가 + 무작위 대기 후 재시도, 연속 실패 시 회로 차단기로 요청 중단
+        - 재시도 후에도 실패한 페이지는 모아 두었다가 마지막에 동시 요청 1개로 다시 수집,
+          그래도 실패하면 물건 목록 None 전달
+        """
+        limiter = limiter or TokenBucket(requests_per_second)
+        breaker = CircuitBreaker()
+        record = getattr(page_infos, 'record', None)
+        dead_letters = []  # 재시도 후에도 실패한 페이지
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            await self.run_fetch_pass(page_infos, result_queue, stop_event, executor, limiter, breaker,
+                                      max_in_flight, record, dead_letters)
             
-            for file in chunk_files:
-                file_path = os.path.join(self.data_folder, file)
-                print(f"파일 처리 중: {file_path}")
-                
+            if dead_letters and not stop_event.is_set():
+                print(f"\n실패한 페이지 {len(dead_letters)}개 다시 수집")
+                await self.run_fetch_pass(dead_letters, result_queue, stop_event, executor, limiter, breaker,
+                                          1, None, None)
+
+    async def run_fetch_pass(self, page_infos, result_queue, stop_event, executor, limiter, breaker,
+                             workers, record, dead_letters):
+        """
+        fetch_pages_async의 수집 한 차례: 끝내 실패한 페이지는 dead_letters에 추가
+        (dead_letters가 None이면 마지막 차례이므로 (페이지 정보, None) 전달)
+        """
+        loop = asyncio.get_running_loop()
+        page_iter = iter(page_infos)
+        retries = []  # (재시도 가능 시각, 시도 횟수, 페이지 정보)
+
+        async def deliver(result):
+            # 큐가 가득 차면 이벤트 루프를 막지 않고 대기 (호출 측이 멈추면 버림)
+            while not stop_event.is_set():
                 try:
-                    df = pd.read_excel(file_path)
-                    all_data.append(df)
-                    print(f"파일 처리 완료: {file_path}")
-                except Exception as e:
-                    print(f"파일 처리 중 오류 발생: {file_path} - {str(e)}")
+                    result_queue.put_nowait(result)
+                    return
+                except queue.Full:
+                    await asyncio.sleep(0.05)
+
+        async def next_page():
+            while True:
+                now = time.monotonic()
+                ready = [entry for entry in retries if entry[0] <= now]
+                if ready:
+                    retries.remove(ready[0])
+                    return ready[0][1], ready[0][2]
+
+                page_info = next(page_iter, None)
+                if page_info is not None:
+                    return 0, page_info
+
+                if not retries:
+                    return None
+                await asyncio.sleep(max(0, min(entry[0] for entry in retries) - now))
+
+        async def worker():
+            while not stop_event.is_set():
+                job = await next_page()
+                if job is None:
+                    return
+                attempt, page_info = job
+                page_no, disposal_method, items_per_page, date_window = page_info
+
+                probe = await breaker.wait()
+                try:
+                    await limiter.acquire()
+                    started = time.monotonic()
+                    items = await loop.run_in_executor(executor, partial(
+                        self.get_auction_items,
+                        num_of_rows=items_per_page,
+                        page_no=page_no,
+                        disposal_method=disposal_method,
+                        date_window=date_window
+                    ))
+                except OnbidApiError as e:
+                    if e.fatal:
+                        raise
+                    if record:
+                        record(page_info, time.monotonic() - started, False)
+                    if e.retryable:
+                        breaker.record_failure()
+                    if e.retryable and attempt < self.max_attempts - 1:
+                        # 재시도 전 대기 (대기 중에도 다른 페이지는 계속 수집)
+                        self.metrics.inc('onbid_retries_total', reason=self.retry_reason(e))
+                        retries.append((time.monotonic() + backoff_delay(attempt + 1), attempt + 1, page_info))
+                    elif dead_letters is not None:
+                        self.metrics.inc('onbid_dead_letters_total')
+                        dead_letters.append(page_info)
+                    else:
+                        print(f"\n페이지 {page_no} 처리 실패: {str(e)}")
+                        self.metrics.inc('onbid_failed_pages_total')
+                        await deliver((page_info, None))
+                    continue
+                finally:
+                    if probe:
+                        breaker.release()
+
+                breaker.record_success()
+                if record:
+                    record(page_info, time.monotonic() - started, True)
+                await deliver((page_info, items))
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    def plan_pages(self, total_count, disposal_method, items_per_page, adaptive,
+                   date_window=None, honored_size=None):
+        """
+        수집할 페이지 목록 생성 (페이지 정보 목록 또는 AdaptivePagePlan)
+        honored_size: 1페이지 응답으로 확인한 서비스 허용 최대 페이지 크기
+        """
+        if not adaptive:
+            total_pages = (total_count + items_per_page - 1) // items_per_page
             
-            if all_data:
-                merged_data = pd.concat(all_data, ignore_index=True)
-                return merged_data.to_dict('records')
-            return []
+            # 페이지 정보 생성
+            page_infos = [(page, disposal_method, items_per_page, date_window) 
+                         for page in range(1, total_pages + 1)]
+            return page_infos
+
+        honored_size = honored_size or items_per_page
+        return AdaptivePagePlan(
+            total_count,
+            disposal_method,
+            page_size=honored_size,
+            min_page_size=items_per_page,
+            max_page_size=honored_size,
+            date_window=date_window
+        )
+
+    def plan_date_windows(self, disposal_method='0001', shard_size=5000, window_days=7,
+                          horizon_days=30, max_workers=4, page_size=1000, min_page_size=100,
+                          requests_per_second=5.0):
+        """
+        입찰일자 구간 분할: [(구간 (시작일, 종료일), 건수, 1페이지 물건 목록, 허용 페이지 크기)] 반환
+        (건수 0인 구간 제외)
+
+        입찰시작일부터 오늘+horizon_days까지 window_days일 단위로 나누고 그 이후는 종료일 없는
+        마지막 구간으로 둔 뒤, 구간별 1페이지(page_size건)를 병렬로 받아 totalCount를 확인하고
+        shard_size보다 큰 구간은 반으로 나눔 (하루짜리 구간은 더 나누지 않음). 깊은 pageNo 탐색 없이
+        짧은 구간을 독립적으로 병렬 수집하기 위함.
+        나눈 뒤에도 shard_size보다 클 것으로 보이는 구간은 행이 버려지므로 min_page_size건으로만 확인하고,
+        그 구간이 확정되면 1페이지(page_size건)를 다시 받아 수집에 사용.
+        요청은 수집 중인 실행의 요청 한도(self.limiter, 없으면 초당 requests_per_second건) 안에서 보냄
+        """
+        fmt = '%Y%m%d'
+        begin = datetime.strptime(self.get_begin_date(), fmt)
+        horizon = datetime.now() + timedelta(days=horizon_days)
+        last_day = begin + timedelta(days=365 + horizon_days)  # 종료일 없는 구간 분할 한도
+        
+        pending = []  # (시작일, 종료일, 확인 페이지 크기)
+        start = begin
+        while start <= horizon:
+            end = min(start + timedelta(days=window_days - 1), horizon)
+            pending.append((start, end, page_size))
+            start = end + timedelta(days=1)
+        pending.append((start, None, page_size))
+        
+        def to_window(span):
+            start, end = span
+            return (start.strftime(fmt), end.strftime(fmt) if end else None)
+        
+        limiter = self.limiter or TokenBucket(requests_per_second)
+        
+        def first_page(span, size):
+            return self.get_first_page(disposal_method, to_window(span), size, min_page_size, limiter=limiter)
+        
+        final = []  # 확정된 구간: (구간, 건수, 1페이지 물건 목록, 허용 페이지 크기 (작은 페이지로 확인했으면 None))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                probes = list(executor.map(lambda entry: first_page(entry[:2], entry[2]), pending))
+                splits = []
+                for (start, end, size), (count, items, honored_size) in zip(pending, probes):
+                    window = ((start, end), count, items, honored_size if size == page_size else None)
+                    # 반으로 나눠도 shard_size보다 클 구간은 건수만 작은 페이지로 확인
+                    split_size = min_page_size if count / 2 > shard_size else page_size
+                    if count <= shard_size:
+                        if count:
+                            final.append(window)
+                    elif end is None:
+                        if start >= last_day:
+                            final.append(window)
+                            continue
+                        # 종료일 없는 구간은 앞쪽 window_days일을 떼어 냄
+                        cut = start + timedelta(days=window_days - 1)
+                        splits += [(start, cut, split_size), (cut + timedelta(days=1), None, min_page_size)]
+                    elif end > start:
+                        middle = start + (end - start) / 2
+                        middle = datetime(middle.year, middle.month, middle.day)
+                        splits += [(start, middle, split_size), (middle + timedelta(days=1), end, split_size)]
+                    else:
+                        final.append(window)
+                pending = splits
             
-        except Exception as e:
-            print(f"청크 파일 병합 중 오류 발생: {str(e)}")
-            raise
-    
-    def get_all_items(self, disposal_method='0001', items_per_page=100, chunk_size=1000):
+            # 작은 페이지로 확인한 구간 중 1페이지에 다 담기지 않은 구간만 page_size건으로 다시 받음
+            refetch = [span for span, count, items, honored_size in final
+                       if honored_size is None and count > len(items)]
+            first_pages = dict(zip(refetch, executor.map(lambda span: first_page(span, page_size), refetch)))
+        
+        windows = []
+        for span, count, items, honored_size in final:
+            # 작은 페이지에 모두 담긴 구간은 허용 크기를 확인하지 않았으므로 다른 구간의 값을 따름
+            count, items, honored_size = first_pages.get(span, (count, items, honored_size or page_size))
+            if count:
+                windows.append((to_window(span), count, items, honored_size))
+        windows.sort(key=lambda entry: entry[0][0])
+        return windows
+
+
+    def chain_page_results(self, first_pages, page_results):
         """
-        전체 공매물건 데이터 수집 (최적화된 버전)
+        이미 받은 페이지를 먼저 내보낸 뒤 나머지 페이지 수집 결과를 이어서 반환
         """
         try:
-            total_count = self.get_total_count(disposal_method)
-            print(f"\n전체 데이터 개수: {total_count:,}개")
+            yield from first_pages
+            yield from page_results
+        finally:
+            page_results.close()
+
+    def is_new_item(self, item, seen_keys):
+        """
+        처음 보는 물건인지 확인하고 seen_keys에 기록 (키 필드가 모두 비어 있으면 항상 새 물건)
+        """
+        key = AuctionSyncStore.item_key(item)
+        if not any(key):
+            return True
+        if key in seen_keys:
+            return False
+        seen_keys.add(key)
+        return True
+
+    def iter_item_batches(self, disposal_method='0001', items_per_page=100, mode='async',
+                          max_in_flight=8, requests_per_second=5.0, adaptive=True, max_page_size=1000,
+                          resume=False, shard=False, shard_size=5000, keep_journal=False,
+                          category=None, region=None, fetch_details=False):
+        """
+        수집 스트림: 페이지가 도착하는 대로 (페이지 정보, 물건 목록) 반환
+
+        전체 목록을 만들지 않으므로 메모리는 동시에 받는 페이지 수만큼만 사용 (중복 확인용 키 제외).
+        resume=True로 저널에서 이어받으면 청크 파일로 저장된 복구 물건을 페이지 정보 None으로 먼저 반환하고,
+        청크 파일로 저장되지 않은 복구 페이지는 새로 받은 페이지처럼 (페이지 정보, 물건 목록)으로 반환.
+        완료된 페이지는 저널에 기록되고, 끝까지 수집했고 실패한 페이지가 없으면 저널 삭제
+        (keep_journal=True면 결과를 저장한 뒤 호출 측에서 삭제).
+        수집 후 self.last_total_count(전체 건수), self.failed_pages(다시 수집해도 실패한 페이지) 확인.
+        fetch_details=True면 반환하는 물건마다 상세 필드를 추가 (저널에는 목록 필드만 기록).
+        옵션은 get_all_items와 같음
+        """
+        def with_details(items):
+            if not fetch_details or not items:
+                return items
+            return merge_details(items, self.fetch_item_details(items, max_in_flight, requests_per_second))
+        
+        first_pages = []  # 건수 확인 때 받은 1페이지 (다시 요청하지 않고 바로 사용)
+        # 처분방식 여러 개를 한 번에 수집 가능 (예: ['0001', '0002'])
+        disposal_methods = [disposal_method] if isinstance(disposal_method, str) else list(disposal_method)
+        
+        self.journal = journal = PageJournal(
+            os.path.join(self.journal_folder, f"kamco_auction_journal_{'_'.join(disposal_methods)}.jsonl")
+        )
+        self.failed_pages = failed_pages = []
+        self.metrics = PipelineMetrics()
+        self.details_enabled = True
+        # 목록 수집과 상세 조회가 함께 쓰는 요청 한도
+        self.limiter = TokenBucket(requests_per_second)
+        if fetch_details:
+            # 상세 조회는 실행 내내 하나의 루프와 작업 스레드로 (배치마다 새 세션을 만들지 않음)
+            self.detail_loop = asyncio.new_event_loop()
+            self.detail_executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        previous_begin_date = self.begin_date
+        previous_filters = self.search_filters
+        page_results = None
+        try:
+            resumed = journal.load() if resume else None
+            if resumed:
+                header, pages = resumed
+                # 이전 실행과 같은 조건으로 이어서 수집 (청크 파일도 같은 실행 ID로 저장)
+                self.run_id = header.get('run_id') or datetime.now().strftime('%Y%m%d_%H%M%S')
+                self.begin_date = header['begin_date']
+                self.search_filters = header.get('filters') or {}
+                # 구간 목록이 없는 이전 형식의 저널도 이어받기 (처분방식별 전체 구간)
+                shards = header.get('shards') or [
+                    {'method': method, 'window': None, 'total_count': count,
+                     'max_page_size': header.get('max_page_sizes', {}).get(method, header.get('max_page_size'))}
+                    for method, count in (header.get('total_counts') or
+                                          {header['disposal_method']: header['total_count']}).items()
+                ]
+                
+                plans = {}
+                for entry in shards:
+                    date_window = tuple(entry['window']) if entry['window'] else None
+                    done = [page for page in pages
+                            if page.get('method', entry['method']) == entry['method']
+                            and (tuple(page['window']) if page.get('window') else None) == date_window]
+                    plans[(entry['method'], date_window)] = PageJournal.missing_pages(
+                        done, entry['total_count'], entry['method'],
+                        header['min_page_size'], entry['max_page_size'], date_window
+                    )
+                restored_items = [item for page in pages if page['chunked'] for item in page['items']]
+                unchunked_pages = [
+                    ((page['page'], page.get('method', shards[0]['method']), page['size'],
+                      tuple(page['window']) if page.get('window') else None), page['items'])
+                    for page in pages if not page['chunked']
+                ]
+                journal.resume()
+                print(f"\n저널에서 복구: {len(pages):,}개 페이지, {sum(len(page['items']) for page in pages):,}건")
+            else:
+                if resume:
+                    print("\n이어받을 저널이 없어 처음부터 수집합니다.")
+                # 수집 도중 날짜가 바뀌어도 같은 조건 유지
+                self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+                self.begin_date = self.get_begin_date()
+                # 용도/소재지 조건은 서버에서 걸러 받음 (받은 뒤 버리는 페이지가 없음)
+                self.search_filters = self.build_search_filters(category, region)
+                if self.search_filters:
+                    print(f"\n조회 조건: {self.search_filters}")
+                
+                shards = []
+                plans = {}
+                # 1페이지 요청 크기: adaptive면 max_page_size 자체를 먼저 확인
+                first_page_size = max(items_per_page, max_page_size) if adaptive else items_per_page
+                for method in disposal_methods:
+                    if shard:
+                        windows = self.plan_date_windows(method, shard_size, page_size=first_page_size,
+                                                         min_page_size=items_per_page,
+                                                         requests_per_second=requests_per_second)
+                        print(f"\n[처분방식 {method}] 입찰일자 구간 {len(windows)}개, "
+                              f"전체 데이터 개수: {sum(entry[1] for entry in windows):,}개")
+                    else:
+                        windows = [(None,) + self.get_first_page(method, None, first_page_size, items_per_page,
+                                                                 limiter=self.limiter)]
+                        print(f"\n[처분방식 {method}] 전체 데이터 개수: {windows[0][1]:,}개")
+                    
+                    honored_size = min((entry[3] for entry in windows), default=first_page_size)
+                    if adaptive:
+                        print(f"\n[처분방식 {method}] 페이지 크기: 최대 {honored_size}건")
+                    for date_window, count, items, _ in windows:
+                        plan = self.plan_pages(count, method, items_per_page, adaptive,
+                                               date_window=date_window, honored_size=honored_size)
+                        # 계획의 첫 페이지는 이미 받은 1페이지의 앞부분과 같음
+                        if isinstance(plan, AdaptivePagePlan):
+                            first_page_info = next(plan, None)
+                        else:
+                            first_page_info, plan = (plan[0], plan[1:]) if plan else (None, plan)
+                        if first_page_info:
+                            first_pages.append((first_page_info, items[:first_page_info[2]]))
+                        plans[(method, date_window)] = plan
+                        shards.append({'method': method, 'window': date_window,
+                                       'total_count': count, 'max_page_size': honored_size})
+                restored_items = []
+                unchunked_pages = []
+                journal.start({
+                    'run_id': self.run_id,
+                    'disposal_methods': disposal_methods,
+                    'begin_date': self.begin_date,
+                    'filters': self.search_filters,
+                    'shards': shards,
+                    'min_page_size': items_per_page,
+                    'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                })
             
-            total_pages = (total_count + items_per_page - 1) // items_per_page
+            # 구간 사이(또는 수집 중 페이지 이동으로) 중복된 물건은 한 번만 포함
+            seen_keys = set()
+            restored_items = [item for item in restored_items if self.is_new_item(item, seen_keys)]
+            unchunked_pages = [(page_info, [item for item in items if self.is_new_item(item, seen_keys)])
+                               for page_info, items in unchunked_pages]
             
-            # 페이지 정보 생성
-            page_infos = [(page, disposal_method, items_per_page) 
-                         for page in range(1, total_pages + 1)]
+            total_count = sum(entry['total_count'] for entry in shards)
+            self.last_total_count = total_count
+            self.last_disposal_methods = sorted({entry['method'] for entry in shards})
+            self.last_search_filters = dict(self.search_filters)
+            if len(disposal_methods) > 1:
+                print(f"\n전체 데이터 개수: {total_count:,}개 (처분방식 {', '.join(disposal_methods)})")
             
-            # CPU 코어 수 제한 (4개만 사용)
-            num_processes = min(4, cpu_count())
-            print(f"\n{num_processes}개의 프로세스로 병렬 처리 시작")
+            # 처분방식/구간별 페이지를 번갈아 수집 (하나의 요청 한도 공유)
+            # 응답 캐시를 쓰면 페이지 크기 고정 (크기가 바뀌면 같은 요청이 아니어서 캐시를 다시 쓸 수 없음)
+            page_infos = InterleavedPagePlan(plans, feedback=self.response_cache is None)
+            if mode != 'async':
+                page_infos = list(page_infos)
+            total_pages = page_infos.total_pages if isinstance(page_infos, InterleavedPagePlan) else len(page_infos)
+            total_pages += len(first_pages)
+            print(f"\n수집할 페이지 수: {total_pages:,}개")
             
-            all_items = []
-            current_chunk = []
-            chunk_count = 0
-
-            # 오류 복구를 위한 재시도 횟수
-            max_retries = 3
+            if mode == 'async':
+                print(f"\n비동기 수집 시작 (동시 요청 {max_in_flight}개, 초당 {requests_per_second}건)")
+                page_results = self.iter_pages_async(page_infos, max_in_flight, requests_per_second,
+                                                     limiter=self.limiter)
+            else:
+                page_results = self.iter_pages_pool(page_infos, requests_per_second, limiter=self.limiter)
+            if first_pages:
+                page_results = self.chain_page_results(first_pages, page_results)
             
-            with Pool(processes=num_processes) as pool:
-                with tqdm(total=total_pages, desc="데이터 수집 중") as pbar:
-                    try:
-                        # imap 사용 (순차적 처리, 더 안정적)
-                        for items in pool.imap(self.fetch_page_data, page_infos):
-                            if items:
-                                all_items.extend(items)
-                                current_chunk.extend(items)
-                                
-                                # chunk_size에 도달하면 청크 저장
-                                if len(current_chunk) >= chunk_size:
-                                    try:
-                                        chunk_count += 1
-                                        self.process_chunk(
-                                            current_chunk, 
-                                            chunk_count, 
-                                            math.ceil(total_count / chunk_size)
-                                        )
-                                        # 성공적으로 저장된 후에만 청크 초기화
-                                        current_chunk = []
-                                    except Exception as e:
-                                        print(f"\n청크 저장 중 오류 발생: {str(e)}")
-                            
-                            pbar.update(1)  # 수정된 부분: pbar.update(1) 위치 이동
-                            # 중간 진행상황 저장
-                            if len(all_items) % (chunk_size * 5) == 0:
-                                try:
-                                    backup_filename = os.path.join(
-                                        self.backup_folder,
-                                        f"kamco_auction_backup_{len(all_items)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                                    )
-                                    self.save_data_to_excel(all_items, backup_filename, is_backup=True)
-                                    print(f"\n중간 백업 완료: {backup_filename} (총 {len(all_items):,}건)")
-                                except Exception as e:
-                                    print(f"\n중간 백업 중 오류 발생: {str(e)}")
-                        
-                        pbar.update(1)
-                        pbar.set_postfix({'수집': f'{len(all_items):,}건'})
-                
-                    except KeyboardInterrupt:
-                        print("\n사용자에 의해 중단됨. 지금까지 수집된 데이터 저장 중...")
-                        # 중단 시점까지의 데이터 저장
-                        if all_items:
-                            try:
-                                interrupt_filename = os.path.join(
-                                    self.backup_folder,
-                                    f"kamco_auction_interrupted_{len(all_items)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                                )
-                                self.save_data_to_excel(all_items, interrupt_filename, is_backup=True)
-                                print(f"\n중단 시점 데이터 저장 완료: {interrupt_filename}")
-                            except Exception as e:
-                                print(f"\n중단 데이터 저장 중 오류 발생: {str(e)}")
-                        raise
+            if restored_items:
+                yield None, with_details(restored_items)
+            harvested = len(restored_items)
+            for page_info, items in unchunked_pages:
+                harvested += len(items)
+                yield page_info, with_details(items)
+            
+            with tqdm(total=total_pages, desc="데이터 수집 중") as pbar:
+                # 페이지 단위 결과를 도착하는 대로 처리
+                for page_info, items in page_results:
+                    pbar.update(1)
+                    if isinstance(page_infos, InterleavedPagePlan):
+                        # 페이지 크기 변경 시 전체 페이지 수 갱신
+                        pbar.total = page_infos.total_pages + len(first_pages)
                     
-                    except Exception as e:
-                        print(f"\n데이터 수집 중 오류 발생: {str(e)}")
-                        if all_items:
-                            try:
-                                error_filename = os.path.join(
-                                    self.backup_folder,
-                                    f"kamco_auction_error_{len(all_items)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                                )
-                                self.save_data_to_excel(all_items, error_filename, is_backup=True)
-                                print(f"\n오류 발생 시점 데이터 저장 완료: {error_filename}")
-                            except Exception as save_error:
-                                print(f"\n오류 데이터 저장 실패: {str(save_error)}")
-                        raise
+                    if items is None:
+                        failed_pages.append(page_info)
+                        continue
+                    if not items:
+                        continue
+                    
+                    # 완료된 페이지는 바로 저널에 기록 (중단 시 --resume으로 이어받기)
+                    journal.append(page_info, items)
+                    
+                    # 처분방식 표시 (응답에 없으면 요청한 처분방식으로 채움)
+                    for item in items:
+                        if not item['처분방식코드']:
+                            item['처분방식코드'] = page_info[1]
+                    items = [item for item in items if self.is_new_item(item, seen_keys)]
+                    harvested += len(items)
+                    self.metrics.inc('onbid_rows_total', len(items))
+                    pbar.set_postfix({'수집': f'{harvested:,}건'})
+                    yield page_info, with_details(items)
+            
+            if failed_pages:
+                print(f"\n수집하지 못한 페이지 {len(failed_pages):,}개 "
+                      f"(수집 {harvested:,}건 / 전체 {total_count:,}건), --resume으로 이어받을 수 있습니다.")
+            elif not keep_journal:
+                journal.remove()
+        
+        finally:
+            if page_results is not None:
+                page_results.close()
+            journal.close()
+            self.begin_date = previous_begin_date
+            self.search_filters = previous_filters
+            self.limiter = None
+            if self.detail_loop is not None:
+                self.detail_executor.shutdown()
+                self.detail_loop.close()
+                self.detail_loop = self.detail_executor = None
+
+    def iter_items(self, **harvest_options):
+        """
+        수집 스트림: 물건을 한 건씩 반환 (옵션은 iter_item_batches/get_all_items와 같음)
+        """
+        for _, items in self.iter_item_batches(**harvest_options):
+            yield from items
+
+    def iter_item_frames(self, chunk_size=1000, enrich=True, **harvest_options):
+        """
+        수집 스트림을 chunk_size건씩 모아 헤더 순서/컬럼 타입이 지정된 DataFrame으로 반환
+        (enrich=True면 가공 단계 적용). save_frames로 바로 저장 가능
+        """
+        batch = []
+        for item in self.iter_items(**harvest_options):
+            batch.append(item)
+            if len(batch) >= chunk_size:
+                yield self.build_frame(batch, enrich)
+                batch = []
+        if batch:
+            yield self.build_frame(batch, enrich)
+
+    def build_frame(self, items, enrich=True):
+        with self.metrics.timer('enrich'):
+            df = build_dataframe(items)
+            return enrich_dataframe(df) if enrich else df
+
+    def save_frames(self, frames, filename):
+        """
+        DataFrame 스트림을 하나의 파일로 저장 (.parquet, .feather, .xlsx), 저장한 행 수 반환
+        """
+        writer = FrameStreamWriter(filename)
+        try:
+            for df in frames:
+                writer.write(df)
+        finally:
+            writer.close()
+        print(f"파일 저장 완료: {writer.filename} ({writer.rows:,}건)")
+        return writer.rows
+
+    def get_all_items(self, disposal_method='0001', items_per_page=100, chunk_size=1000,
+                      mode='async', max_in_flight=8, requests_per_second=5.0,
+                      adaptive=True, max_page_size=1000, save_files=True, resume=False,
+                      export_excel=False, backup_interval=300, enrich=True,
+                      shard=False, shard_size=5000, return_items=True, build_index=False,
+                      track_prices=False, fetch_details=False, category=None, region=None):
+        """
+        전체 공매물건 데이터 수집 (최적화된 버전)
+
+        disposal_method: 처분방식코드 (0001 매각, 0002 임대) 또는 그 목록 (여러 처분방식을 함께 수집)
+
+        mode='async'   : asyncio 기반 수집 (동시 요청 수 max_in_flight, 전체 초당 요청 수 requests_per_second)
+        mode='process' : multiprocessing 기반 수집 (요청 한도/재시도/회로 차단은 async와 같음)
+        adaptive=True  : 허용되는 최대 페이지 크기를 확인한 뒤 (items_per_page ~ max_page_size)
+                         응답 시간/오류율에 따라 페이지 크기 조정 (process 모드는 확인된 크기로 고정)
+        save_files=False : 청크/중간 백업/최종 파일을 저장하지 않음 (동기화 모드에서 사용)
+        resume=True    : 이전 실행의 저널이 있으면 빠진 페이지만 수집하고 나머지는 저널에서 복구
+        export_excel=True : 최종 데이터를 컬럼형 파일과 함께 엑셀로도 저장
+        backup_interval : 청크가 chunk_size에 못 미쳐도 이 시간(초)이 지나면 저장하지 않은 행을 청크로 저장
+        enrich=True    : 최종 데이터에 가공 단계 적용 (가격 숫자 변환, 주거용건물 동/층/호 추출)
+        shard=True     : 입찰일자 구간(PBCT_BEGN_DTM~PBCT_CLS_DTM)별로 나눠 병렬 수집
+                         (구간당 최대 shard_size건, 구간 사이 중복 물건은 한 번만 포함)
+        return_items=False : 수집한 물건 목록을 메모리에 모으지 않음 (파일로만 저장, 메모리는 청크 크기만큼)
+        build_index=True : 수집한 물건을 조회용 저장소(SQLite)에도 저장 (query_items로 조회)
+        track_prices=True : 물건관리번호별 가격/상태 이력 기록 (값이 바뀐 물건만, price_history로 조회)
+                            수집이 끝난 뒤 물건별 최신 공고로 한 번 기록 (중단/오류 시에는 기록하지 않음)
+        category / region : 용도(예: '주거용건물')/소재지(예: ('서울특별시', '강남구')) 조건을
+                            온비드 코드표로 확인해 서버에서 걸러 받음 (조건에 맞는 페이지만 요청)
+        fetch_details=True : 수집한 물건마다 물건 상세 정보(물건정보조회서비스) 필드 추가
+                             (페이지를 받을 때마다 동시에 조회, 물건이력번호가 같으면 저장된 결과 사용).
+                             반환 목록, 동기화 변경분, 청크/최종 파일 모두 상세 필드 포함
+
+        수집은 iter_item_batches 스트림으로 받고, 청크가 찰 때마다 청크 파일과 최종 파일(가공 후)에
+        이어서 기록하므로 최종 파일도 전체 데이터를 한 번에 메모리에 올리지 않음
+        """
+        all_items = []     # 반환할 전체 목록 (return_items=True일 때만)
+        current_chunk = []  # 아직 파일로 저장하지 않은 행
+        chunk_pages = []    # current_chunk에 담긴 페이지 (청크로 저장하면 저널에 표시)
+        chunk_count = None
+        last_flush = time.monotonic()
+        final_writers = []  # 최종 파일 (청크를 저장할 때마다 이어서 기록)
         
-            # 남은 청크 처리
-            if current_chunk:
+        def write_final(rows):
+            if not save_files or not rows:
+                return
+            if not final_writers:
+                partial = os.path.join(self.backup_folder, f"kamco_auction_partial_{self.run_id}")
+                final_writers.append(FrameStreamWriter(f"{partial}.{self.output_format}"))
+                if export_excel and self.output_format != 'xlsx':
+                    final_writers.append(FrameStreamWriter(f"{partial}.xlsx"))
+            for start in range(0, len(rows), chunk_size):
+                frame = self.build_frame(rows[start:start + chunk_size], enrich)
+                for writer in final_writers:
+                    with self.metrics.timer('write', target=os.path.splitext(writer.filename)[1][1:]):
+                        writer.write(frame)
+        
+        def finish_final(prefix):
+            """
+            최종 파일을 닫고 건수/시각이 들어간 이름으로 변경, 저장한 파일 이름 목록 반환
+            """
+            filenames = []
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            for writer in final_writers:
+                writer.close()
+                filename = os.path.join(
+                    self.backup_folder,
+                    f"{prefix}_{writer.rows}_{stamp}{os.path.splitext(writer.filename)[1]}"
+                )
+                os.replace(writer.filename, filename)
+                filenames.append(filename)
+            final_writers.clear()
+            return filenames
+        
+        def flush_chunk():
+            """
+            아직 청크 파일로 저장하지 않은 행(current_chunk)을 다음 번호의 청크 파일로 저장
+            """
+            nonlocal chunk_count
+            if chunk_count is None:
+                # 이어받은 실행이면 기존 청크의 가장 큰 번호 다음부터 저장 (중간에 빠진 번호가 있어도 겹치지 않음)
+                chunk_count = max((number for number, _ in self.list_chunk_files(self.run_id)), default=0)
+            chunk_count += 1
+            with self.metrics.timer('write', target='chunk'):
+                self.process_chunk(
+                    current_chunk, 
+                    chunk_count, 
+                    max(chunk_count, math.ceil(self.last_total_count / chunk_size))
+                )
+            # 이어받을 때 청크로 저장되지 않은 페이지만 다시 청크로 저장하도록 저널에 표시
+            self.journal.mark_chunked(chunk_pages)
+            chunk_pages.clear()
+        
+        def save_partial(prefix, label):
+            # 중단/오류 시점까지의 데이터 저장 (최종 파일에 이어서 기록 중이면 그 파일을 마무리)
+            if save_files and current_chunk:
+                # 저널에 기록된 행은 이어받을 때 청크로 다시 저장하지 않으므로 여기서 청크로 저장
                 try:
-                    chunk_count += 1
-                    self.process_chunk(
-                        current_chunk, 
-                        chunk_count, 
-                        math.ceil(total_count / chunk_size)
-                    )
+                    flush_chunk()
                 except Exception as e:
-                    print(f"\n최종 청크 저장 중 오류 발생: {str(e)}")
-            
-            # 최종 파일 저장
+                    print(f"\n{label} 청크 저장 중 오류 발생: {str(e)}")
             try:
-                final_filename = os.path.join(
-                    self.backup_folder,
-                    f"kamco_auction_full_{len(all_items)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                )
-                self.save_data_to_excel(all_items, final_filename, is_backup=True)
-                print(f"\n최종 데이터 저장 완료: {final_filename} (총 {len(all_items):,}건)")
+                write_final(current_chunk)
+                if final_writers:
+                    for filename in finish_final(prefix):
+                        print(f"\n{label} 데이터 저장 완료: {filename}")
+                elif all_items:
+                    filename = os.path.join(
+                        self.backup_folder,
+                        f"{prefix}_{len(all_items)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{self.output_format}"
+                    )
+                    self.save_data(all_items, filename)
+                    print(f"\n{label} 데이터 저장 완료: {filename}")
             except Exception as e:
-                print(f"\n최종 데이터 저장 중 오류 발생: {str(e)}")
-            
-            print(f"\n수집된 전체 데이터 개수: {len(all_items):,}개")
-            return all_items
+                print(f"\n{label} 데이터 저장 중 오류 발생: {str(e)}")
+            finally:
+                for writer in final_writers:
+                    writer.close()
+        
+        batches = self.iter_item_batches(
+            disposal_method, items_per_page, mode, max_in_flight, requests_per_second, adaptive,
+            max_page_size, resume, shard, shard_size, keep_journal=save_files,
+            category=category, region=region, fetch_details=fetch_details
+        )
+        index_store = AuctionIndexStore(self.index_db_path) if build_index else None
+        history_store = PriceHistoryStore(self.history_db_path) if track_prices else None
+        history_latest = {}  # 물건관리번호별 최신 공고 (저널에서 복구한 물건 포함, 수집이 끝나면 기록)
+        harvested = 0
+        try:
+            for page_info, items in batches:
+                if save_files and page_info is not None:
+                    # 저널에 기록된 페이지는 바로 청크 대상에 추가 (중단되면 save_partial이 청크로 저장)
+                    current_chunk.extend(items)
+                    chunk_pages.append(page_info)
+                harvested += len(items)
+                if return_items:
+                    all_items.extend(items)
+                if index_store is not None:
+                    # 페이지 단위로 한 번에 저장 (저널에서 복구한 물건은 이전 실행에서 이미 저장됨)
+                    if page_info is not None:
+                        with self.metrics.timer('index'):
+                            index_store.load(items, self.run_id)
+                if history_store is not None:
+                    PriceHistoryStore.merge_latest(history_latest, items)
+                if not save_files:
+                    continue
+                
+                if page_info is None:
+                    # 저널에서 복구한 물건 중 청크 파일로 이미 저장된 물건
+                    write_final(items)
+                    continue
+                
+                # 중간 백업: chunk_size에 도달하거나 backup_interval초가 지나면
+                # 아직 저장하지 않은 행만 청크 파일로 저장 (행당 저장 비용 일정)
+                flush_due = (len(current_chunk) >= chunk_size or
+                             time.monotonic() - last_flush >= backup_interval)
+                if current_chunk and flush_due:
+                    try:
+                        flush_chunk()
+                        write_final(current_chunk)
+                        # 성공적으로 저장된 후에만 청크 초기화
+                        current_chunk = []
+                        last_flush = time.monotonic()
+                    except Exception as e:
+                        print(f"\n청크 저장 중 오류 발생: {str(e)}")
+        
+        except KeyboardInterrupt:
+            print("\n사용자에 의해 중단됨. 지금까지 수집된 데이터 저장 중...")
+            save_partial('kamco_auction_interrupted', '중단 시점')
+            self.save_metrics(status='interrupted')
+            raise
         
         except Exception as e:
-            print(f"\n치명적 오류 발생: {str(e)}")
+            print(f"\n데이터 수집 중 오류 발생: {str(e)}")
+            save_partial('kamco_auction_error', '오류 발생 시점')
+            self.save_metrics(status='error')
             raise
+        
+        finally:
+            batches.close()
+        
+        if history_store is not None:
+            try:
+                with self.metrics.timer('history'):
+                    changed = history_store.record(history_latest.values(), self.run_id)
+                print(f"\n가격/상태 이력 기록: {len(history_latest):,}개 물건 중 {changed:,}개 변경")
+            except Exception as e:
+                print(f"\n가격/상태 이력 기록 중 오류 발생: {str(e)}")
+        
+        if not save_files:
+            print(f"\n수집된 전체 데이터 개수: {harvested:,}개")
+            self.save_metrics()
+            return all_items
+        
+        # 남은 청크 처리
+        if current_chunk:
+            try:
+                flush_chunk()
+            except Exception as e:
+                print(f"\n최종 청크 저장 중 오류 발생: {str(e)}")
+        
+        # 최종 파일 저장
+        try:
+            write_final(current_chunk)
+            for filename in finish_final('kamco_auction_full'):
+                print(f"\n최종 데이터 저장 완료: {filename} (총 {harvested:,}건)")
+            # 최종 파일까지 저장되고 빠진 페이지가 없으면 저널은 더 이상 필요 없음
+            if not self.failed_pages:
+                self.journal.remove()
+        except Exception as e:
+            print(f"\n최종 데이터 저장 중 오류 발생: {str(e)}")
+        
+        print(f"\n수집된 전체 데이터 개수: {harvested:,}개")
+        self.save_metrics()
+        return all_items
+
+    def save_metrics(self, status='completed'):
+        """
+        수집 지표를 Prometheus 텍스트(.prom)와 실행 요약(.json)으로 저장하고 단계별 시간 출력
+        """
+        try:
+            summary = self.metrics.summary(
+                run_id=self.run_id,
+                status=status,
+                total_count=self.last_total_count,
+                failed_pages=len(getattr(self, 'failed_pages', []))
+            )
+            prom_filename = os.path.join(self.metrics_folder, f"kamco_metrics_{self.run_id}.prom")
+            with open(prom_filename, 'w', encoding='utf-8') as f:
+                f.write(self.metrics.to_prometheus())
+            summary_filename = os.path.join(self.metrics_folder, f"kamco_run_{self.run_id}.json")
+            with open(summary_filename, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            
+            print("\n단계별 처리 시간:")
+            for stage, stats in summary['stages'].items():
+                print(f"  {stage}: {stats['count']:,}회, 합계 {stats['total_seconds']:.1f}초, "
+                      f"평균 {stats['avg_seconds'] * 1000:.1f}ms, p95 {stats['p95_seconds'] * 1000:.0f}ms")
+            print(f"지표 저장 완료: {prom_filename}, {summary_filename}")
+        except Exception as e:
+            print(f"\n지표 저장 중 오류 발생: {str(e)}")
+
+    def sync_items(self, disposal_method='0001', export_excel=False, **harvest_options):
+        """
+        증분 동기화: 이전 수집 결과(로컬 저장소)와 비교해 변경분만 반영하고 변경분만 파일로 저장
+
+        API에 변경분 조회 기능이 없어 목록은 전체를 조회하지만, 청크/백업/전체 파일 저장과
+        이후 처리는 신규/변경/종료된 물건에만 적용됨.
+        종료 처리는 이번에 수집한 처분방식과 용도/소재지 조건 범위의 물건에만 적용
+        """
+        items = self.get_all_items(disposal_method, save_files=False, **harvest_options)
+
+        # 일부 페이지가 실패해 수집 건수가 부족하면 빠진 물건을 종료 처리하지 않음
+        complete = self.last_total_count is not None and len(items) >= self.last_total_count
+        if not complete:
+            print("\n수집 건수가 전체 건수보다 적어 종료 처리는 건너뜁니다.")
+
+        store = AuctionSyncStore(self.sync_db_path)
+        delta = store.sync(items, retire_missing=complete,
+                           methods=self.last_disposal_methods, filters=self.last_search_filters)
+        print(f"\n동기화 완료: 신규 {len(delta['inserted']):,}건, 변경 {len(delta['updated']):,}건, 종료 {len(delta['retired']):,}건")
+
+        delta_items = (
+            [dict(item, 변경구분='신규') for item in delta['inserted']] +
+            [dict(item, 변경구분='변경') for item in delta['updated']] +
+            [dict(item, 변경구분='종료') for item in delta['retired']]
+        )
+        if delta_items:
+            delta_filename = os.path.join(
+                self.backup_folder,
+                f"kamco_auction_delta_{len(delta_items)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{self.output_format}"
+            )
+            self.save_data(delta_items, delta_filename)
+            print(f"\n변경분 저장 완료: {delta_filename} (총 {len(delta_items):,}건)")
+            
+            if export_excel and not delta_filename.endswith('.xlsx'):
+                self.save_data_to_excel(delta_items, os.path.splitext(delta_filename)[0] + '.xlsx')
+
+        return delta
+
+    def index_files(self, file_paths):
+        """
+        저장된 데이터 파일(.parquet, .feather, .xlsx)을 조회용 저장소에 저장 (이전 실행 결과 반영용)
+        """
+        store = AuctionIndexStore(self.index_db_path)
+        total = 0
+        for file_path in file_paths:
+            df = self.read_data_file(file_path)
+            run_id = os.path.splitext(os.path.basename(file_path))[0]
+            for start in range(0, len(df), 10000):
+                total += store.load(df.iloc[start:start + 10000].to_dict('records'), run_id)
+            print(f"조회용 저장소에 저장: {file_path} ({len(df):,}건)")
+        return total
+
+    def query_items(self, **filters):
+        """
+        조회용 저장소에서 조건에 맞는 물건 목록 반환 (조건은 AuctionIndexStore.query 참고)
+        """
+        return AuctionIndexStore(self.index_db_path).query(**filters)
+
+    def price_history(self, mnmt_no):
+        """
+        물건관리번호의 가격/상태 변경 이력 반환
+        """
+        return PriceHistoryStore(self.history_db_path).history(mnmt_no)
+
+    def find_bargains(self, min_drop_rate=0.3, min_failures=None, limit=100):
+        """
+        최초 감정가 대비 최저입찰가 하락률이 높은 물건 목록 반환 (기록된 집계만 조회)
+        """
+        return PriceHistoryStore(self.history_db_path).summary(min_drop_rate, min_failures, limit)
 
     def fetch_page_data(self, page_info):
         """
-        단일 페이지 데이터 수집 (개선된 버전)
+        단일 페이지를 한 번 요청 (multiprocessing 작업 프로세스용): (물건 목록, 오류, 이 페이지의 지표) 반환
+
+        요청 간격/재시도/회로 차단은 부모 프로세스(run_pool_pass)가 정하므로 오류는 예외 대신 돌려줌.
+        작업 프로세스의 지표는 부모 프로세스에 남지 않으므로 페이지마다 새로 기록해 돌려줌
         """
-        page_no, disposal_method, items_per_page = page_info
-        
-        for attempt in range(3):
-            try:
-                # API 호출 간격 증가 (2초)
-                time.sleep(2)
-                
-                items = self.get_auction_items(
-                    num_of_rows=items_per_page,
-                    page_no=page_no,
-                    disposal_method=disposal_method
-                )
-                return items
-            except Exception as e:
-                if attempt == 2:  # 마지막 시도
-                    print(f"\n페이지 {page_no} 처리 실패: {str(e)}")
-                    return []
-                time.sleep(5)  # 재시도 전 대기 시간 증가
-        return []
+        page_no, disposal_method, items_per_page, date_window = page_info
+        self.metrics = PipelineMetrics()
+        try:
+            items = self.get_auction_items(
+                num_of_rows=items_per_page,
+                page_no=page_no,
+                disposal_method=disposal_method,
+                date_window=date_window
+            )
+            return items, None, self.metrics
+        except OnbidApiError as e:
+            return None, e, self.metrics
 
 def main():
+    parser = argparse.ArgumentParser(description="온비드 이용기관 공매물건 수집")
+    parser.add_argument('--sync', action='store_true',
+                        help="이전 수집 결과와 비교해 변경분(신규/변경/종료)만 저장")
+    parser.add_argument('--resume', action='store_true',
+                        help="중단된 수집을 저널에서 이어받아 빠진 페이지만 수집")
+    parser.add_argument('--format', choices=['parquet', 'feather', 'xlsx'], default='parquet',
+                        help="청크/백업/최종 데이터 저장 포맷 (기본: parquet)")
+    parser.add_argument('--excel', action='store_true',
+                        help="최종 데이터를 엑셀로도 내보내기")
+    parser.add_argument('--methods', nargs='+', default=['0001'], metavar='DPSL_MTD_CD',
+                        help="수집할 처분방식코드 (예: --methods 0001 0002, 기본: 0001 매각)")
+    parser.add_argument('--shard', action='store_true',
+                        help="입찰일자 구간별로 나눠 병렬 수집 (깊은 페이지 탐색 없이)")
+    parser.add_argument('--shard-size', type=int, default=5000,
+                        help="구간당 최대 건수, 넘으면 구간을 나눔 (기본: 5000)")
+    parser.add_argument('--cache-ttl', type=int, default=0, metavar='SECONDS',
+                        help="API 응답을 디스크에 캐시하고 이 시간(초) 동안 재사용 (기본: 0, 사용 안 함)")
+    parser.add_argument('--cache-max-mb', type=int, default=500,
+                        help="응답 캐시 최대 크기(MB), 넘으면 오래 사용하지 않은 응답부터 삭제 (기본: 500)")
+    parser.add_argument('--offline', action='store_true',
+                        help="API를 호출하지 않고 캐시된 응답만으로 다시 처리")
+    parser.add_argument('--index', action='store_true',
+                        help="수집한 물건을 조회용 저장소(backup/kamco_auction_index.db)에도 저장")
+    parser.add_argument('--history', action='store_true',
+                        help="물건별 가격/상태 이력 기록 (backup/kamco_auction_history.db, 바뀐 값만)")
+    parser.add_argument('--category', metavar='NAME',
+                        help="용도 조건, 서버에서 걸러 받음 (예: 주거용건물, '부동산 / 토지', 코드 10200)")
+    parser.add_argument('--region', nargs='+', metavar='ADDR',
+                        help="소재지 조건: 시도 [시군구 [읍면동]] (예: --region 서울특별시 강남구)")
+    parser.add_argument('--refresh-codes', action='store_true',
+                        help="온비드 코드표(용도/소재지)를 다시 조회")
+    parser.add_argument('--details', action='store_true',
+                        help="수집한 물건에 상세 정보(물건정보조회서비스) 추가 (조회 결과는 캐시)")
+    args = parser.parse_args()
+    
+    if not SERVICE_KEY and not args.offline:
+        print(".env 파일에 API_KEY_KAMCO_Decoding를 설정해주세요.")
+        sys.exit(1)
+
     try:
         print("이용기관 공고 목록 조회 서비스 시작")
         
-        service = KamcoAuctionService(SERVICE_KEY)
+        service = KamcoAuctionService(
+            SERVICE_KEY,
+            timeout=(5, 30),            # (연결, 응답) 타임아웃 초
+            pool_size=10,               # 작업자별 커넥션 풀 크기
+            output_format=args.format,  # 저장 포맷
+            cache_ttl=args.cache_ttl,   # 응답 캐시 유지 시간(초)
+            cache_max_mb=args.cache_max_mb,
+            offline=args.offline        # 캐시된 응답만 사용
+        )
         
-        # chunk_size를 조정하여 메모리 사용량과 성능 최적화
-        items = service.get_all_items(
-            items_per_page=100,  # API 호출당 데이터 수
-            chunk_size=1000      # 청크당 데이터 수
+        harvest_options = dict(
+            disposal_method=args.methods,  # 처분방식 (여러 개면 한 번에 번갈아 수집)
+            items_per_page=100,       # API 호출당 최소 데이터 수
+            mode='async',             # 비동기 수집
+            adaptive=True,            # 허용 최대 페이지 크기 확인 후 응답 시간에 따라 조정
+            max_page_size=1000,       # 페이지 크기 상한
+            max_in_flight=8,          # 동시 요청 수
+            requests_per_second=5.0,  # 전체 초당 요청 수 (API 트래픽 한도에 맞춰 조정)
+            resume=args.resume,       # 저널에서 이어받기
+            shard=args.shard,         # 입찰일자 구간별 병렬 수집
+            shard_size=args.shard_size,
+            build_index=args.index,   # 조회용 저장소에 저장
+            track_prices=args.history,  # 가격/상태 이력 기록
+            fetch_details=args.details,  # 물건 상세 정보 추가
+            category=args.category,   # 용도 조건 (서버 측 필터)
+            region=args.region,       # 소재지 조건 (서버 측 필터)
+            export_excel=args.excel   # 엑셀 내보내기
         )
         
+        if args.refresh_codes:
+            service.code_table.refresh()
+        
+        if args.sync:
+            # 증분 동기화 (변경분만 저장)
+            service.sync_items(**harvest_options)
+        else:
+            # chunk_size를 조정하여 메모리 사용량과 성능 최적화
+            service.get_all_items(
+                chunk_size=1000,      # 청크당 데이터 수
+                return_items=False,   # 물건 목록을 메모리에 모으지 않고 파일로만 저장
+                **harvest_options
+            )
+        
         print("\n프로그램 종료")
         
     except Exception as e:
@@ -0,0 +1,360 @@
+"""
+온비드 이용기관 공매물건조회 API 대역 서버 (로컬 테스트/벤치마크용)
+
+UtlinsttPblsalThingInquireSvc/getPublicSaleObject와 같은 형식의 XML을 합성 데이터로 응답.
+- numOfRows / pageNo / DPSL_MTD_CD / PBCT_BEGN_DTM / PBCT_CLS_DTM 조건 반영
+- 물건 상세 조회(ThingInfoInquireSvc/getUnifyUsageCltrBasicInfoDetail, CLTR_NO/PBCT_NO)도 응답
+- 온비드코드조회(OnbidCodeInfoInquireSvc 용도1/2, 주소1/2/3) 응답, 목록 조회의 용도/소재지 조건 반영
+  (CTGR_HIRK_ID / CTGR_HIRK_ID_MID / SIDO / SGK / EMD)
+- 응답 지연(기본 + 행당), 오류 응답(resultCode), 최대 페이지 크기, 전체 건수 설정 가능
+실행: python onbid_stub_server.py --port 8080 --total 10000 --latency 0.2 --error-rate 0.01
+"""
+import argparse
+import bisect
+import random
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SERVICE_PATH = "/openapi/services/UtlinsttPblsalThingInquireSvc"
+DETAIL_SERVICE_PATH = "/openapi/services/ThingInfoInquireSvc"
+CODE_SERVICE_PATH = "/openapi/services/OnbidCodeInfoInquireSvc"
+
+# Open API 에러 코드 (활용가이드 기준)
+ERROR_CODES = {
+    '01': 'APPLICATION_ERROR',
+    '02': 'DB_ERROR',
+    '04': 'HTTP_ERROR',
+    '05': 'SERVICETIMEOUT_ERROR',
+    '22': 'LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR',
+    '99': 'UNKNOWN_ERROR'
+}
+
+CATEGORIES = [
+    ('0001', '주거용건물 / 아파트'),
+    ('0001', '주거용건물 / 다세대주택'),
+    ('0001', '주거용건물 / 오피스텔'),
+    ('0001', '토지 / 대'),
+    ('0001', '토지 / 전'),
+    ('0001', '상가용및업무용건물 / 근린생활시설'),
+    ('0001', '차량및운송장비 / 승용차'),
+    ('0001', '유가증권 / 주식'),
+    ('0001', '회원권 / 골프회원권'),
+    ('0002', '상가용및업무용건물 / 근린생활시설'),
+    ('0002', '토지 / 대')
+]
+
+# 용도 코드 (대분류 → 중분류), 합성 데이터의 용도명 앞부분이 중분류 이름
+CATEGORY_CODES = {
+    ('10000', '부동산'): [('10100', '토지'), ('10200', '주거용건물'), ('10300', '상가용및업무용건물')],
+    ('11000', '권리·증권'): [('11100', '유가증권'), ('11200', '회원권')],
+    ('12000', '자동차·운송장비'): [('12100', '차량및운송장비')]
+}
+MIDDLE_CODES = {name: (middle_id, top_id) for (top_id, _), middles in CATEGORY_CODES.items()
+                for middle_id, name in middles}
+
+REGIONS = [
+    ('서울특별시', '강남구', '역삼동', '테헤란로'),
+    ('서울특별시', '마포구', '공덕동', '마포대로'),
+    ('부산광역시', '해운대구', '우동', '해운대로'),
+    ('경기도', '성남시 분당구', '정자동', '정자일로'),
+    ('대전광역시', '유성구', '봉명동', '대학로'),
+    ('경상남도', '창원시 성산구', '상남동', '중앙대로')
+]
+
+class StubDataset:
+    """
+    합성 공매물건 데이터 (처분방식별로 입찰시작일 순 정렬)
+    """
+    def __init__(self, total=10000, seed=0, begin_date=None, days=60):
+        self.total = total
+        rng = random.Random(seed)
+        start = begin_date or (datetime.now() - timedelta(days=7))
+
+        by_method = {}
+        for i in range(total):
+            method, category = CATEGORIES[rng.randrange(len(CATEGORIES))]
+            begin = start + timedelta(days=rng.randrange(days), hours=rng.choice([9, 10, 14]))
+            region = rng.choice(REGIONS)
+            middle_id, top_id = MIDDLE_CODES[category.split(' / ')[0]]
+            by_method.setdefault(method, []).append((
+                begin.strftime('%Y%m%d'),
+                (top_id, middle_id, region[0], region[1], region[2]),
+                self.build_item(i, rng, method, category, begin, region)
+            ))
+
+        self.items = {}
+        self.dates = {}
+        self.keys = {}  # 행별 (대분류, 중분류, 시도, 시군구, 읍면동)
+        for method, rows in by_method.items():
+            rows.sort(key=lambda row: row[0])
+            self.dates[method] = [date for date, _, _ in rows]
+            self.keys[method] = [key for _, key, _ in rows]
+            self.items[method] = [xml for _, _, xml in rows]
+
+    def build_item(self, i, rng, method, category, begin, region):
+        """
+        물건 한 건의 XML (RNUM 제외, 응답할 때 순번을 붙임)
+        """
+        sido, sgk, emd, road = region
+        appraisal = rng.randrange(10, 5000) * 1000000
+        rate = rng.choice([100, 90, 80, 70, 60, 50])
+        fields = {
+            'PLNM_NO': str(600000 + i // 5),
+            'PBCT_NO': str(8000000 + i),
+            'PBCT_CDTN_NO': str(rng.randrange(1, 4)),
+            'CLTR_NO': str(1500000 + i),
+            'CLTR_HSTR_NO': str(2500000 + i),
+            'SCRN_GRP_CD': '0001',
+            'CTGR_FULL_NM': category,
+            'BID_MNMT_NO': f"{rng.randrange(1, 99):03d}",
+            'CLTR_NM': f"{sido} {sgk} {emd} {rng.randrange(1, 999)}",
+            'CLTR_MNMT_NO': f"{begin.year}-{i:05d}-001",
+            'LDNM_ADRS': f"{sido} {sgk} {emd} {rng.randrange(1, 999)}-{rng.randrange(1, 30)}",
+            'NMRD_ADRS': f"{sido} {sgk} {road} {rng.randrange(1, 300)}",
+            'LDNM_PNU': str(rng.randrange(10 ** 18, 10 ** 19)),
+            'DPSL_MTD_CD': method,
+            'DPSL_MTD_NM': '매각' if method == '0001' else '임대(대부)',
+            'BID_MTD_NM': '일반경쟁(최고가방식) / 총액',
+            'MIN_BID_PRC': str(appraisal * rate // 100),
+            'APSL_ASES_AVG_AMT': str(appraisal),
+            'FEE_RATE': f"({rate}%)",
+            'PBCT_BEGN_DTM': begin.strftime('%Y%m%d%H%M%S'),
+            'PBCT_CLS_DTM': (begin + timedelta(days=2, hours=7)).strftime('%Y%m%d%H%M%S'),
+            'PBCT_CLTR_STAT_NM': rng.choice(['인터넷입찰진행중', '입찰준비중']),
+            'USCBD_CNT': str(rng.randrange(0, 6)),
+            'IQRY_CNT': str(rng.randrange(0, 3000)),
+            'GOODS_NM': '',
+            'MANF': '', 'MDL': '', 'NRGT': '', 'GRBX': '', 'ENDPC': '', 'VHCL_MLGE': '', 'FUEL': '',
+            'SCRT_NM': '', 'TPBZ': '', 'ITM_NM': '', 'MMB_RGT_NM': '',
+            'CLTR_IMG_FILE': f"https://www.onbid.co.kr/images/cltr/{1500000 + i}.jpg"
+        }
+
+        if category.startswith('주거용건물'):
+            dong, floor = rng.randrange(101, 120), rng.randrange(1, 30)
+            fields['CLTR_NM'] += f" {dong}동 {floor}층 {floor}{rng.randrange(1, 5):02d}호"
+            fields['GOODS_NM'] = f"건물 {rng.randrange(40, 200)}㎡, 대지권 {rng.randrange(10, 80)}㎡"
+        elif category.startswith('차량'):
+            fields.update({
+                'CLTR_NM': f"승용차 {rng.choice(['쏘나타', '그랜저', 'K5'])}",
+                'MANF': rng.choice(['현대', '기아']), 'MDL': rng.choice(['쏘나타', '그랜저', 'K5']),
+                'NRGT': str(rng.randrange(2010, 2024)), 'GRBX': '자동', 'ENDPC': '1999cc',
+                'VHCL_MLGE': f"{rng.randrange(1000, 200000)}km", 'FUEL': rng.choice(['휘발유', '경유'])
+            })
+        elif category.startswith('유가증권'):
+            fields.update({'SCRT_NM': f"주식회사 온비드{i % 50}", 'TPBZ': '제조업', 'ITM_NM': '보통주'})
+        elif category.startswith('회원권'):
+            fields['MMB_RGT_NM'] = f"온비드 컨트리클럽 {rng.choice(['정회원', '주중회원'])}"
+
+        return ''.join(f"<{tag}>{value}</{tag}>" for tag, value in fields.items())
+
+    def query(self, method, begin_date=None, end_date=None, filters=None):
+        """
+        조건에 맞는 물건 XML 목록 (입찰시작일 begin_date ~ end_date, YYYYMMDD)
+        filters: (대분류, 중분류, 시도, 시군구, 읍면동) 조건, None인 항목은 조건 없음
+        """
+        dates = self.dates.get(method, [])
+        lo = bisect.bisect_left(dates, begin_date) if begin_date else 0
+        hi = bisect.bisect_right(dates, end_date) if end_date else len(dates)
+        items = self.items.get(method, [])[lo:hi]
+        if not filters or not any(filters):
+            return items
+        keys = self.keys[method][lo:hi]
+        return [item for item, key in zip(items, keys)
+                if all(want is None or want == have for want, have in zip(filters, key))]
+
+def build_response(rows, num_of_rows, page_no, total_count, result_code='00', result_msg='NORMAL SERVICE.'):
+    """
+    getPublicSaleObject 형식의 응답 XML
+    """
+    start = (page_no - 1) * num_of_rows
+    items = ''.join(
+        f"<item><RNUM>{start + n + 1}</RNUM>{row}</item>" for n, row in enumerate(rows)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f"<response><header><resultCode>{result_code}</resultCode><resultMsg>{result_msg}</resultMsg></header>"
+        f"<body><items>{items}</items><numOfRows>{num_of_rows}</numOfRows>"
+        f"<pageNo>{page_no}</pageNo><totalCount>{total_count}</totalCount></body></response>"
+    ).encode('utf-8')
+
+def build_detail_response(cltr_no, result_code='00', result_msg='NORMAL SERVICE.'):
+    """
+    getUnifyUsageCltrBasicInfoDetail 형식의 응답 XML (물건번호로 값을 정해 항상 같은 응답)
+    """
+    fields = ''
+    if result_code == '00' and cltr_no.isdigit():
+        rng = random.Random(int(cltr_no))
+        region = rng.choice(REGIONS)
+        values = {
+            'CTGR_TYPE_NM': '부동산',
+            'PRPT_DVSN_NM': rng.choice(['압류재산(캠코)', '국유재산(캠코)', '수탁재산(캠코)']),
+            'ORG_NM': '한국자산관리공사',
+            'RGST_DEPT_NM': f"{region[0][:2]}지역본부",
+            'PSCG_NM': '조세정리팀',
+            'PSCG_TPNO': f"02-{rng.randrange(1000, 9999)}-{rng.randrange(1000, 9999)}",
+            'DLGT_ORG_NM': f"{region[1]}세무서",
+            'LAND_SQMS': f"{rng.randrange(10, 5000)}㎡",
+            'BLD_SQMS': f"{rng.randrange(20, 300)}.{rng.randrange(0, 99):02d}",
+            'SHR_YN': rng.choice(['Y', 'N']),
+            'POSI_ENV_PSCD': f"{region[2]} 인근에 위치하며 대중교통 이용 가능함.",
+            'UTLZ_PSCD': rng.choice(['주거용으로 이용중임.', '공실 상태임.', '나대지 상태임.']),
+            'PCMT_PYMT_EPDT_CNTN': rng.choice(['30일', '60일']),
+            'DLVR_RSBY': '매수인'
+        }
+        fields = '<item>' + ''.join(f"<{tag}>{value}</{tag}>" for tag, value in values.items()) + '</item>'
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f"<response><header><resultCode>{result_code}</resultCode><resultMsg>{result_msg}</resultMsg></header>"
+        f"<body>{fields}</body></response>"
+    ).encode('utf-8')
+
+def build_code_response(rows, num_of_rows=10, page_no=1):
+    """
+    온비드코드조회 형식의 응답 XML (rows: 항목별 {태그: 값})
+    """
+    start = (page_no - 1) * num_of_rows
+    items = ''.join(
+        '<item>' + ''.join(f"<{tag}>{value}</{tag}>" for tag, value in row.items()) + '</item>'
+        for row in rows[start:start + num_of_rows]
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        "<response><header><resultCode>00</resultCode><resultMsg>NORMAL SERVICE.</resultMsg></header>"
+        f"<body><items>{items}</items><pageNo>{page_no}</pageNo><totalCount>{len(rows)}</totalCount>"
+        f"<numOfRows>{num_of_rows}</numOfRows></body></response>"
+    ).encode('utf-8')
+
+def code_rows(operation, query):
+    """
+    온비드코드조회 오퍼레이션별 항목 목록
+    """
+    if operation == 'getOnbidTopCodeInfo':
+        return [{'CTGR_ID': top_id, 'CTGR_NM': name, 'CTGR_HIRK_ID': '1', 'CTGR_HIRK_NM': 'ONBID'}
+                for top_id, name in CATEGORY_CODES]
+    if operation == 'getOnbidMiddleCodeInfo':
+        return [{'CTGR_ID': middle_id, 'CTGR_NM': middle_name, 'CTGR_HIRK_ID': top_id, 'CTGR_HIRK_NM': top_name}
+                for (top_id, top_name), middles in CATEGORY_CODES.items() if top_id == query.get('CTGR_ID')
+                for middle_id, middle_name in middles]
+    if operation == 'getOnbidAddr1Info':
+        return [{'ADDR1': sido} for sido in dict.fromkeys(region[0] for region in REGIONS)]
+    if operation == 'getOnbidAddr2Info':
+        return [{'ADDR2': sgk} for sgk in dict.fromkeys(r[1] for r in REGIONS if r[0] == query.get('ADDR1'))]
+    if operation == 'getOnbidAddr3Info':
+        return [{'ADDR3': emd} for emd in dict.fromkeys(r[2] for r in REGIONS
+                                                        if r[:2] == (query.get('ADDR1'), query.get('ADDR2')))]
+    return None
+
+def make_server(port=8080, total=10000, latency=0.0, latency_per_row=0.0, error_rate=0.0,
+                error_codes=('22',), max_rows=1000, seed=0, host='127.0.0.1'):
+    """
+    대역 서버 생성 (serve_forever는 호출 측에서 실행)
+    서버 객체의 request_count / error_count로 받은 요청 수와 오류 응답 수, dataset으로 합성 데이터 확인
+    (상세 조회 요청 수는 detail_count, 코드조회 요청 수는 code_count, 각 서비스 주소는 detail_url / code_url)
+    """
+    dataset = StubDataset(total, seed)
+    error_rng = random.Random(seed + 1)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            if url.path.startswith(f"{CODE_SERVICE_PATH}/"):
+                rows = code_rows(url.path.rsplit('/', 1)[1], query)
+                if rows is None:
+                    self.send_body(404, b'Not Found')
+                    return
+                with lock:
+                    server.code_count += 1
+                self.send_body(200, build_code_response(rows, int(query.get('numOfRows') or 10),
+                                                        int(query.get('pageNo') or 1)))
+                return
+
+            is_detail = url.path == f"{DETAIL_SERVICE_PATH}/getUnifyUsageCltrBasicInfoDetail"
+            if url.path != f"{SERVICE_PATH}/getPublicSaleObject" and not is_detail:
+                self.send_body(404, b'Not Found')
+                return
+
+            with lock:
+                server.request_count += 1
+                if is_detail:
+                    server.detail_count += 1
+                failed = error_rng.random() < error_rate
+                if failed:
+                    server.error_count += 1
+                    error_code = error_rng.choice(list(error_codes))
+
+            if is_detail:
+                time.sleep(latency)
+                if failed:
+                    body = build_detail_response('', error_code, ERROR_CODES.get(error_code, 'UNKNOWN_ERROR'))
+                else:
+                    body = build_detail_response(query.get('CLTR_NO', ''))
+                self.send_body(200, body)
+                return
+
+            num_of_rows = min(int(query.get('numOfRows') or 10), max_rows)
+            page_no = int(query.get('pageNo') or 1)
+            time.sleep(latency + latency_per_row * num_of_rows)
+
+            if failed:
+                body = build_response([], num_of_rows, page_no, 0, error_code, ERROR_CODES.get(error_code, 'UNKNOWN_ERROR'))
+            else:
+                rows = dataset.query(query.get('DPSL_MTD_CD', '0001'),
+                                     query.get('PBCT_BEGN_DTM'), query.get('PBCT_CLS_DTM'),
+                                     tuple(query.get(tag) for tag in ('CTGR_HIRK_ID', 'CTGR_HIRK_ID_MID',
+                                                                      'SIDO', 'SGK', 'EMD')))
+                start = (page_no - 1) * num_of_rows
+                body = build_response(rows[start:start + num_of_rows], num_of_rows, page_no, len(rows))
+            self.send_body(200, body)
+
+        def send_body(self, status, body):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/xml;charset=UTF-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.dataset = dataset
+    server.request_count = 0
+    server.error_count = 0
+    server.detail_count = 0
+    server.code_count = 0
+    server.base_url = f"http://{host}:{server.server_address[1]}{SERVICE_PATH}"
+    server.detail_url = f"http://{host}:{server.server_address[1]}{DETAIL_SERVICE_PATH}"
+    server.code_url = f"http://{host}:{server.server_address[1]}{CODE_SERVICE_PATH}"
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="온비드 공매물건조회 API 대역 서버")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--total', type=int, default=10000, help="합성 물건 수 (기본: 10000)")
+    parser.add_argument('--latency', type=float, default=0.0, help="요청당 기본 지연(초)")
+    parser.add_argument('--latency-per-row', type=float, default=0.0, help="행당 추가 지연(초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument('--error-codes', nargs='+', default=['22'], choices=sorted(ERROR_CODES),
+                        help="오류 응답에 사용할 resultCode (기본: 22 요청제한횟수 초과)")
+    parser.add_argument('--max-rows', type=int, default=1000, help="허용 최대 numOfRows (기본: 1000)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.total, args.latency, args.latency_per_row,
+                         args.error_rate, args.error_codes, args.max_rows, args.seed)
+    print(f"대역 서버 시작: {server.base_url} (물건 {args.total:,}건)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n종료 (요청 {server.request_count:,}건, 오류 응답 {server.error_count:,}건)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+DataFrame 가공/저장 단위 테스트 (네트워크 불필요)
+
+- enrich_dataframe: 가격 숫자 변환, 주거용건물 주소의 동/층/호 추출
+- add_detail_url: 상세 페이지 URL 컬럼
+- FrameStreamWriter: 엑셀(쓰기 전용) 저장 시 물건관리번호 하이퍼링크
+실행: python -m pytest -q tests
+"""
+import os
+import sys
+
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import DETAIL_URL_BASE, DETAIL_URL_COLUMN, FrameStreamWriter, add_detail_url, enrich_dataframe  # noqa: E402
+
+def test_enrich_converts_prices():
+    df = pd.DataFrame({'감정가': ['1,234,000', '', None], '최저입찰가': ['900000', 'abc', '1,000']}, dtype='string')
+    enriched = enrich_dataframe(df)
+
+    assert enriched['감정가'].tolist() == [1234000, pd.NA, pd.NA]
+    assert enriched['최저입찰가'].tolist() == [900000, pd.NA, 1000]
+    assert str(enriched['감정가'].dtype) == 'Int64'
+    # 원본은 바꾸지 않음
+    assert df['감정가'].tolist()[0] == '1,234,000'
+
+def test_enrich_extracts_unit_parts_for_residential_only():
+    rows = [
+        ('주거용건물 / 아파트', '서울특별시 강남구 역삼동 123-4 에이아파트 101동 15층 1502호', ''),
+        ('주거용건물 / 다세대주택', '서울특별시 마포구 망원로 45 가동 3층 301-2호', ''),
+        ('주거용건물 / 아파트', '', '서울특별시 송파구 올림픽로 1 B동 2층 ２０１호'),
+        ('주거용건물 / 오피스텔', '부산광역시 해운대구 우2 123 에이타워 7층 701호', ''),
+        ('주거용건물 / 단독주택', '경기도 양평군 양평읍 100', ''),
+        ('토지 / 대', '서울특별시 강남구 역삼동 101동 1층 101호', '')
+    ]
+    df = pd.DataFrame(rows, columns=['용도명', '물건소재지(지번)', '물건소재지(도로명)'], dtype='string')
+    enriched = enrich_dataframe(df)
+
+    # 동: 숫자동 > 한 글자동 > 영문동 > 타워/빌딩, 호: 붙은 숫자 (전각 숫자 포함)
+    assert enriched['동'].tolist() == ['101동', '가동', 'B동', '에이타워', '', '']
+    assert enriched['층'].tolist() == ['15', '3', '2', '7', '', '']
+    assert enriched['호'].tolist() == ['1502', '2', '２０１', '701', '', '']
+
+def test_enrich_without_address_columns_adds_empty_parts():
+    enriched = enrich_dataframe(pd.DataFrame({'용도명': ['주거용건물 / 아파트']}))
+
+    assert enriched[['동', '층', '호']].values.tolist() == [['', '', '']]
+
+def detail_frame():
+    return pd.DataFrame({
+        '물건관리번호': ['2024-0001-000001', '2024-0001-000002', '2024-0001-000003'],
+        '물건명': ['아파트', '토지', '상가'],
+        '물건이력번호': ['11', '21', '31'],
+        '물건번호': ['1', '2', '3'],
+        '공고번호': ['100', '200', '300'],
+        '공매번호': ['1000', '2000', ''],
+        '화면그룹코드': ['0001', '0001', '0001'],
+        '공매조건번호': ['1', '1', '1']
+    }, dtype='string')
+
+def test_add_detail_url_requires_every_parameter():
+    df = add_detail_url(detail_frame())
+
+    assert df[DETAIL_URL_COLUMN].tolist() == [
+        f"{DETAIL_URL_BASE}?cltrHstrNo=11&cltrNo=1&plnmNo=100&pbctNo=1000&scrnGrpCd=0001&pbctCdtnNo=1",
+        f"{DETAIL_URL_BASE}?cltrHstrNo=21&cltrNo=2&plnmNo=200&pbctNo=2000&scrnGrpCd=0001&pbctCdtnNo=1",
+        ''
+    ]
+    # 파라미터 컬럼이 없으면 그대로
+    assert DETAIL_URL_COLUMN not in add_detail_url(pd.DataFrame({'물건명': ['아파트']})).columns
+
+def test_excel_writer_links_management_number(tmp_path):
+    filename = str(tmp_path / 'items.xlsx')
+    frame = detail_frame()
+    writer = FrameStreamWriter(filename)
+    # 조각을 나눠 써도 행마다 자기 URL이 걸림
+    writer.write(frame.iloc[:1])
+    writer.write(frame.iloc[1:].reset_index(drop=True))
+    writer.close()
+
+    sheet = openpyxl.load_workbook(filename)['공매물건목록']
+    header = [cell.value for cell in sheet[1]]
+    assert DETAIL_URL_COLUMN not in header
+    cells = [row[header.index('물건관리번호')] for row in sheet.iter_rows(min_row=2)]
+    assert [cell.value for cell in cells] == frame['물건관리번호'].tolist()
+    expected = add_detail_url(detail_frame())[DETAIL_URL_COLUMN].tolist()
+    assert [cell.hyperlink.target if cell.hyperlink else '' for cell in cells] == expected
+    assert cells[0].font.underline == 'single'
@@ -0,0 +1,171 @@
+"""
+수집 파이프라인 회귀 테스트 (로컬 대역 서버 사용, API 키 불필요)
+
+대역 서버(onbid_stub_server)를 띄우고 KamcoAuctionService로 확인
+- 전체 수집 (async/process): 건수, 중복 없음
+- 증분 동기화: 신규/변경/종료
+- 중단 후 이어받기: 빠짐없이 수집
+- 응답 캐시: 오프라인 재처리
+- 용도/소재지 조건: 서버 측 필터와 동기화 종료 범위
+실행: python -m pytest -q tests
+"""
+import os
+import re
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import DETAIL_COLUMNS, AuctionSyncStore, DetailedAuctionRecord, KamcoAuctionService  # noqa: E402
+from onbid_stub_server import make_server  # noqa: E402
+
+HARVEST_OPTIONS = dict(items_per_page=100, max_page_size=500, requests_per_second=500.0, max_in_flight=8)
+
+def start_server(total=1500):
+    server = make_server(0, total)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+@pytest.fixture(scope='module')
+def server():
+    server = start_server()
+    yield server
+    server.shutdown()
+
+def make_service(server, **options):
+    """
+    대역 서버를 바라보는 서비스 (청크/백업 폴더는 현재 작업 폴더에 생성)
+    """
+    service = KamcoAuctionService('stub-service-key', **options)
+    service.base_url = server.base_url
+    service.detail_url = server.detail_url
+    service.code_url = server.code_url
+    return service
+
+@pytest.fixture
+def service(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return make_service(server)
+
+def item_keys(items):
+    return [AuctionSyncStore.item_key(item) for item in items]
+
+def test_harvest_returns_every_row_once(server, service):
+    items = service.get_all_items(save_files=False, **HARVEST_OPTIONS)
+
+    assert len(items) == len(server.dataset.query('0001'))
+    assert len(items) == service.last_total_count
+    assert len(set(item_keys(items))) == len(items)
+
+def test_process_mode_returns_every_row_and_counts_worker_requests(server, service):
+    requests_before = server.request_count
+    items = service.get_all_items(save_files=False, mode='process', **HARVEST_OPTIONS)
+
+    assert len(items) == len(server.dataset.query('0001'))
+    assert len(set(item_keys(items))) == len(items)
+    counters = service.metrics.summary()['counters']
+    assert sum(counters['onbid_requests_total'].values()) == server.request_count - requests_before
+
+def test_harvest_sharded_matches_full_harvest(server, service):
+    full = service.get_all_items(save_files=False, **HARVEST_OPTIONS)
+    sharded = service.get_all_items(save_files=False, shard=True, shard_size=300, **HARVEST_OPTIONS)
+
+    assert sorted(item_keys(sharded)) == sorted(item_keys(full))
+
+def test_harvest_with_details_returns_detail_fields(service):
+    items = service.get_all_items(save_files=False, fetch_details=True, **HARVEST_OPTIONS)
+
+    assert items and all(set(DETAIL_COLUMNS) <= set(item) for item in items)
+    assert all(item['담당자'] for item in items)
+    # 상세 필드도 값 목록으로 보관 (물건마다 dict를 만들지 않음)
+    assert all(type(item) is DetailedAuctionRecord for item in items)
+
+def test_sync_reports_inserted_updated_retired(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server = start_server(total=500)
+    try:
+        service = make_service(server)
+        first = service.sync_items(**HARVEST_OPTIONS)
+        assert len(first['inserted']) == len(server.dataset.query('0001'))
+        assert not first['updated'] and not first['retired']
+
+        unchanged = service.sync_items(**HARVEST_OPTIONS)
+        assert not any(unchanged.values())
+
+        # 한 건은 최저입찰가 변경, 한 건은 목록에서 사라짐
+        rows = server.dataset.items['0001']
+        rows[0] = re.sub(r'<MIN_BID_PRC>\d+</MIN_BID_PRC>', '<MIN_BID_PRC>1</MIN_BID_PRC>', rows[0])
+        removed = re.search(r'<CLTR_NO>(\d+)</CLTR_NO>', rows[-1]).group(1)
+        for column in (server.dataset.items, server.dataset.dates, server.dataset.keys):
+            del column['0001'][-1]
+
+        delta = service.sync_items(**HARVEST_OPTIONS)
+        assert not delta['inserted']
+        assert [item['최저입찰가'] for item in delta['updated']] == ['1']
+        assert [item['물건번호'] for item in delta['retired']] == [removed]
+    finally:
+        server.shutdown()
+
+def test_sync_ignores_detail_fields_when_toggling_details(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server = start_server(total=500)
+    try:
+        service = make_service(server)
+        service.sync_items(**HARVEST_OPTIONS)
+
+        # 상세 조회를 켜거나 끄기만 해서는 변경으로 보지 않음
+        with_details = service.sync_items(fetch_details=True, **HARVEST_OPTIONS)
+        assert not any(with_details.values())
+        without_details = service.sync_items(**HARVEST_OPTIONS)
+        assert not any(without_details.values())
+    finally:
+        server.shutdown()
+
+def test_sync_retires_only_within_filter_scope(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server = start_server(total=500)
+    try:
+        service = make_service(server)
+        service.sync_items(**HARVEST_OPTIONS)
+
+        # 서울 물건만 조회해도 다른 시도 물건은 종료 처리하지 않음
+        scoped = service.sync_items(region='서울특별시', **HARVEST_OPTIONS)
+        assert not any(scoped.values())
+
+        items = service.get_all_items(save_files=False, category='주거용건물', **HARVEST_OPTIONS)
+        assert items and all(item['용도명'].startswith('주거용건물') for item in items)
+        assert len(items) == sum(1 for key in server.dataset.keys['0001'] if key[1] == '10200')
+    finally:
+        server.shutdown()
+
+def test_resume_after_interruption_completes_harvest(server, service):
+    expected = sorted(item_keys(service.get_all_items(save_files=False, **HARVEST_OPTIONS)))
+
+    # 몇 페이지만 받고 중단 (저널은 남음)
+    batches = service.iter_item_batches(adaptive=False, keep_journal=True, **HARVEST_OPTIONS)
+    partial = []
+    for _, items in batches:
+        partial.extend(items)
+        if len(partial) >= 300:
+            break
+    batches.close()
+    assert 0 < len(partial) < len(expected)
+    assert os.listdir(service.journal_folder)
+
+    resumed = service.get_all_items(save_files=False, resume=True, adaptive=False, **HARVEST_OPTIONS)
+    assert sorted(item_keys(resumed)) == expected
+    assert not os.listdir(service.journal_folder)
+
+def test_offline_replay_uses_cached_responses(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    online = make_service(server, cache_ttl=3600)
+    items = online.get_all_items(save_files=False, **HARVEST_OPTIONS)
+
+    requests_before = server.request_count
+    offline = make_service(server, offline=True)
+    replayed = offline.get_all_items(save_files=False, **HARVEST_OPTIONS)
+
+    assert server.request_count == requests_before
+    assert sorted(item_keys(replayed)) == sorted(item_keys(items))
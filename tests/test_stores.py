@@ -0,0 +1,175 @@
+"""
+로컬 저장소/지표 단위 테스트 (네트워크 불필요)
+
+- ResponseCache: TTL 만료, 오프라인 모드, 크기 상한 초과 시 LRU 삭제
+- AuctionIndexStore: 조건 조회(PNU/용도/마감일시/가격), 같은 물건 갱신
+- PriceHistoryStore: 값이 바뀐 경우만 이력 추가, 하락률/유찰횟수 집계
+- PipelineMetrics: Prometheus 텍스트 형식
+실행: python -m pytest -q tests
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from main import AuctionIndexStore, PipelineMetrics, PriceHistoryStore, ResponseCache  # noqa: E402
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    캐시가 보는 현재 시각 (테스트에서 직접 진행)
+    """
+    now = [1_000_000.0]
+    monkeypatch.setattr(main.time, 'time', lambda: now[0])
+    return now
+
+def test_response_cache_expires_after_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=60)
+    key = ResponseCache.make_key('getKamcoPbctCltrList', {'pageNo': 1, 'serviceKey': 'secret'})
+    cache.put(key, b'<response/>')
+
+    clock[0] += 59
+    assert cache.get(key) == b'<response/>'
+    # 오프라인 모드는 TTL과 관계없이 사용
+    clock[0] += 3600
+    assert ResponseCache(str(tmp_path / 'cache'), ttl=60, offline=True).get(key) == b'<response/>'
+    assert cache.get(key) is None
+    assert not os.path.exists(cache.path_for(key))
+
+def test_response_cache_key_ignores_service_key():
+    params = {'pageNo': 1, 'numOfRows': 100}
+    assert (ResponseCache.make_key('list', {**params, 'serviceKey': 'a'}) ==
+            ResponseCache.make_key('list', {'numOfRows': '100', 'pageNo': '1', 'serviceKey': 'b'}))
+    assert ResponseCache.make_key('list', params) != ResponseCache.make_key('list', {**params, 'pageNo': 2})
+
+def test_response_cache_evicts_least_recently_used(tmp_path, clock):
+    folder = str(tmp_path / 'cache')
+    body = b'<item>' * 200
+    cache = ResponseCache(folder, ttl=3600)
+    keys = [ResponseCache.make_key('list', {'pageNo': page}) for page in range(3)]
+    cache.put(keys[0], body)
+    # 응답 두 개까지만 들어가는 크기 상한
+    cache.max_bytes = os.path.getsize(cache.path_for(keys[0])) * 2
+
+    clock[0] += 1
+    cache.put(keys[1], body)
+    clock[0] += 1
+    assert cache.get(keys[0]) == body  # 첫 응답을 다시 사용해 두 번째 응답이 가장 오래됨
+    clock[0] += 1
+    cache.put(keys[2], body)
+
+    assert cache.get(keys[1]) is None
+    assert not os.path.exists(cache.path_for(keys[1]))
+    assert cache.get(keys[0]) == body
+    assert cache.get(keys[2]) == body
+
+def index_item(cltr_no, pnu, usage, closing, price, status='인터넷입찰진행중', hstr_no='1'):
+    return {
+        '물건번호': cltr_no, '물건이력번호': hstr_no, '공매조건번호': '1', '처분방식코드': '0001',
+        '지번PNU': pnu, '용도명': usage, '입찰마감일시': closing, '최저입찰가': price, '물건상태': status
+    }
+
+@pytest.fixture
+def index_store(tmp_path):
+    store = AuctionIndexStore(str(tmp_path / 'index.db'))
+    store.load([
+        index_item('1', '1168010100100010000', '주거용건물 / 아파트', '20260105170000', '250,000,000'),
+        index_item('2', '1168010300100020000', '주거용건물 / 다세대주택', '20260112170000', '180000000'),
+        index_item('3', '1168010100100030000', '토지 / 대', '20260106170000', '90000000'),
+        index_item('4', '1165010100100040000', '주거용건물 / 아파트', '20260107170000', '400000000'),
+        index_item('5', '1168010100100050000', '주거용건물 / 아파트', '20260108170000', '310000000', status='입찰준비중')
+    ], run_id='first')
+    return store
+
+def cltr_nos(items):
+    return [item['물건번호'] for item in items]
+
+def test_index_store_query_filters(index_store):
+    assert index_store.count() == 5
+    assert cltr_nos(index_store.query(pnu_prefix='1168010', usage='주거용건물')) == ['1', '5', '2']
+    assert cltr_nos(index_store.query(usage='주거용건물 / 아파트', max_price=300000000)) == ['1']
+    assert cltr_nos(index_store.query(min_price=250000000, order_by='최저입찰가')) == ['1', '5', '4']
+    assert cltr_nos(index_store.query(closing_after='20260106', closing_before=datetime(2026, 1, 8))) == ['3', '4']
+    assert cltr_nos(index_store.query(status='입찰준비중')) == ['5']
+    assert cltr_nos(index_store.query(disposal_method='0002')) == []
+    assert len(index_store.query(limit=2)) == 2
+
+def test_index_store_load_updates_same_listing(index_store):
+    index_store.load([index_item('1', '1168010100100010000', '주거용건물 / 아파트', '20260105170000', '200000000')],
+                     run_id='second')
+
+    assert index_store.count() == 5
+    [item] = index_store.query(pnu_prefix='11680101001000100')
+    assert item['최저입찰가'] == 200000000
+    with pytest.raises(ValueError):
+        index_store.query(order_by='물건명')
+
+def listing(hstr_no, price, failures, status='인터넷입찰진행중', mnmt_no='2024-0001-000001'):
+    return {
+        '물건관리번호': mnmt_no, '물건이력번호': hstr_no, '공매조건번호': '1', '최저입찰가': price,
+        '감정가': '100,000,000', '유찰횟수': failures, '물건상태': status, '물건명': '테스트 아파트',
+        '용도명': '주거용건물 / 아파트', '입찰마감일시': '20260105170000'
+    }
+
+def test_price_history_records_only_changes(tmp_path):
+    store = PriceHistoryStore(str(tmp_path / 'history.db'))
+    assert store.record([listing('1', '100000000', '0')], run_id='r1') == 1
+    assert store.record([listing('1', '100000000', '0')], run_id='r2') == 0
+
+    # 유찰 후 재공고 (같은 실행에 이전 공고가 함께 있어도 최신 공고만 기록)
+    assert store.record([listing('1', '100000000', '0'), listing('2', '90000000', '1')], run_id='r3') == 1
+    # 저장된 공고보다 이전 공고는 무시
+    assert store.record([listing('1', '100000000', '0')], run_id='r4') == 0
+    assert store.record([listing('10', '70000000', '0')], run_id='r5') == 1
+
+    history = store.history('2024-0001-000001')
+    assert [row['최저입찰가'] for row in history] == [100000000, 90000000, 70000000]
+    assert [row['실행ID'] for row in history] == ['r1', 'r3', 'r5']
+
+    [summary] = store.summary()
+    assert summary['최초감정가'] == 100000000
+    assert summary['현재최저입찰가'] == summary['최저가'] == 70000000
+    assert summary['하락률'] == 0.3
+    # 유찰횟수 0 -> 1 -> (재공고로 다시 시작) 0: 누적 1
+    assert summary['유찰횟수'] == 1
+    assert summary['변경횟수'] == 2
+
+def test_price_history_summary_filters_by_drop_rate(tmp_path):
+    store = PriceHistoryStore(str(tmp_path / 'history.db'))
+    store.record([
+        listing('1', '50000000', '3', mnmt_no='A'),
+        listing('1', '95000000', '0', mnmt_no='B')
+    ])
+
+    assert [row['물건관리번호'] for row in store.summary()] == ['A', 'B']
+    assert [row['물건관리번호'] for row in store.summary(min_drop_rate=0.3)] == ['A']
+    assert [row['물건관리번호'] for row in store.summary(min_failures=1)] == ['A']
+    assert PriceHistoryStore.drop_rate(100000000, 70000000) == 0.3
+    assert PriceHistoryStore.drop_rate(None, 70000000) is None
+    assert PriceHistoryStore.drop_rate(100000000, None) is None
+
+def test_metrics_prometheus_text():
+    metrics = PipelineMetrics()
+    metrics.inc('onbid_requests_total', source='network')
+    metrics.inc('onbid_requests_total', source='network')
+    metrics.inc('onbid_requests_total', source='cache')
+    metrics.observe('onbid_stage_seconds', 0.003, stage='request')
+    metrics.observe('onbid_stage_seconds', 0.2, stage='request')
+
+    lines = metrics.to_prometheus().splitlines()
+    assert lines.count('# TYPE onbid_requests_total counter') == 1
+    assert 'onbid_requests_total{source="network"} 2' in lines
+    assert 'onbid_requests_total{source="cache"} 1' in lines
+    assert '# TYPE onbid_stage_seconds histogram' in lines
+    # 구간 건수는 누적
+    assert 'onbid_stage_seconds_bucket{stage="request",le="0.001"} 0' in lines
+    assert 'onbid_stage_seconds_bucket{stage="request",le="0.005"} 1' in lines
+    assert 'onbid_stage_seconds_bucket{stage="request",le="0.25"} 2' in lines
+    assert 'onbid_stage_seconds_bucket{stage="request",le="+Inf"} 2' in lines
+    assert 'onbid_stage_seconds_sum{stage="request"} 0.203000' in lines
+    assert 'onbid_stage_seconds_count{stage="request"} 2' in lines
+    assert lines[-1].startswith('onbid_run_seconds ')